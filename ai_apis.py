@@ -3,6 +3,7 @@ import logging
 import requests
 import random
 import time
+from typing import Iterator
 
 # To use HuggingFace, you will need to install the library:
 # pip install huggingface_hub
@@ -17,6 +18,11 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
+class AIResponseError(Exception):
+    """Raised internally when a provider request fails; the message is the user-facing error text."""
+
+
 class AIManager:
     """
     Manages API interactions with various AI providers.
@@ -24,6 +30,8 @@ class AIManager:
     """
     MAX_RETRIES = 5
     BASE_DELAY = 1
+    # Providers whose chat-completions endpoint supports server-sent-event streaming
+    STREAMING_TOOLS = ("OpenAI", "Groq AI", "OpenRouterAI")
 
     def __init__(self, tool_name: str, api_key: str = None):
         """
@@ -35,11 +43,17 @@ class AIManager:
             api_key (str, optional): The API key for the service. 
                                      If not provided, it will be loaded from settings.
         """
-        if tool_name not in self._get_default_settings():
+        # Built fresh per instance: self.settings is mutated (API key) and must not be shared
+        default_settings = self._get_default_settings()
+        if tool_name not in default_settings:
             raise ValueError(f"Tool '{tool_name}' is not supported.")
 
         self.tool_name = tool_name
-        self.settings = self._get_default_settings().get(self.tool_name, {})
+        self.settings = default_settings[self.tool_name]
+        # Reused across calls so keep-alive connections (and TLS sessions) are not re-established per request
+        self.session = requests.Session()
+        self._hf_client = None
+        self._hf_client_key = None
         
         if api_key:
             self.settings["API_KEY"] = api_key
@@ -101,6 +115,13 @@ class AIManager:
         Returns:
             str: The AI-generated response or an error message.
         """
+        try:
+            return self._generate_response(prompt, override_settings)
+        except AIResponseError as e:
+            return str(e)
+
+    def _generate_response(self, prompt: str, override_settings: dict = None) -> str:
+        """Like generate_response, but raises AIResponseError instead of returning error text."""
         current_settings = self.settings.copy()
         if override_settings:
             current_settings.update(override_settings)
@@ -108,9 +129,9 @@ class AIManager:
         api_key = current_settings.get("API_KEY")
 
         if not api_key or api_key == "putinyourkey":
-            return f"Error: API Key for {self.tool_name} is not set."
+            raise AIResponseError(f"Error: API Key for {self.tool_name} is not set.")
         if not prompt:
-            return "Error: Input prompt cannot be empty."
+            raise AIResponseError("Error: Input prompt cannot be empty.")
 
         logger.info(f"Submitting prompt to {self.tool_name} with model {current_settings.get('MODEL')}")
 
@@ -123,9 +144,12 @@ class AIManager:
 
     def _handle_huggingface(self, prompt, settings, api_key):
         if not HUGGINGFACE_AVAILABLE:
-            return "Error: huggingface_hub library not found. Please run 'pip install huggingface_hub'."
+            raise AIResponseError("Error: huggingface_hub library not found. Please run 'pip install huggingface_hub'.")
         try:
-            client = InferenceClient(token=api_key)
+            if self._hf_client is None or self._hf_client_key != api_key:
+                self._hf_client = InferenceClient(token=api_key)
+                self._hf_client_key = api_key
+            client = self._hf_client
             messages = []
             system_prompt = settings.get("system_prompt", "").strip()
             if system_prompt:
@@ -159,40 +183,113 @@ class AIManager:
         except HfHubHTTPError as e:
             error_msg = f"HuggingFace API Error: {e.response.status_code} - {e.response.reason}\n\n{e.response.text}"
             logger.error(error_msg, exc_info=True)
-            return error_msg
+            raise AIResponseError(error_msg) from e
         except Exception as e:
             logger.error(f"HuggingFace Client Error: {e}", exc_info=True)
-            return f"HuggingFace Client Error: {e}"
+            raise AIResponseError(f"HuggingFace Client Error: {e}") from e
 
-    def _handle_rest_api(self, prompt, settings, api_key):
-        url, payload, headers = "", {}, {}
+    def generate_response_stream(self, prompt: str, override_settings: dict = None) -> Iterator[str]:
+        """
+        Generates a response, yielding text chunks as they arrive.
+
+        OpenAI-compatible providers are streamed over server-sent events; every other
+        provider yields a single complete string, so callers can treat all providers the
+        same way. Failures raise AIResponseError, even after some chunks were yielded, so
+        a partial answer is never mistaken for a complete one.
+        """
+        current_settings = self.settings.copy()
+        if override_settings:
+            current_settings.update(override_settings)
+
+        api_key = current_settings.get("API_KEY")
+        if self.tool_name not in self.STREAMING_TOOLS or not prompt or not api_key or api_key == "putinyourkey":
+            yield self._generate_response(prompt, override_settings)
+            return
+
+        logger.info(f"Streaming prompt to {self.tool_name} with model {current_settings.get('MODEL')}")
         try:
-            # --- Helper to safely add params ---
-            def add_param(p_dict, key, p_type):
-                val_str = str(settings.get(key, '')).strip()
-                if val_str:
-                    try:
-                        converted_val = p_type(val_str)
-                        if converted_val or isinstance(converted_val, (int, float)) and converted_val == 0:
-                           p_dict[key] = converted_val
-                    except (ValueError, TypeError):
-                        logger.warning(f"Could not convert {key} value '{val_str}' to {p_type}")
+            url, headers, payload = self._prepare_rest_request(prompt, current_settings, api_key)
+        except Exception as e:
+            logger.error(f"Error configuring API for {self.tool_name}: {e}", exc_info=True)
+            raise AIResponseError(f"Error configuring API request: {e}") from e
+        payload["stream"] = True
 
-            # --- Get URL and Headers ---
-            url, headers = self._get_api_endpoint_and_headers(api_key)
-            
-            # --- Build Payload ---
-            payload = self._build_payload(prompt, settings, add_param)
+        try:
+            with self.session.post(url, json=payload, headers=headers, timeout=60, stream=True) as response:
+                if response.status_code == 429:
+                    # Fall back to the non-streaming path, which retries with backoff
+                    yield self._handle_rest_api(prompt, current_settings, api_key)
+                    return
+                response.raise_for_status()
+                # Decode explicitly: SSE responses often omit a charset and requests would assume latin-1
+                for raw_line in response.iter_lines():
+                    line = raw_line.decode('utf-8')
+                    if not line.startswith("data: "):
+                        continue
+                    data = line[len("data: "):]
+                    if data == "[DONE]":
+                        break
+                    event = json.loads(data)
+                    if event.get('error'):
+                        error = event['error']
+                        error_msg = f"API Stream Error: {error.get('message', error) if isinstance(error, dict) else error}"
+                        logger.error(error_msg)
+                        raise AIResponseError(error_msg)
+                    # Usage-only and keep-alive events carry an empty choices list
+                    choices = event.get('choices')
+                    if not choices:
+                        continue
+                    delta = (choices[0].get('delta') or {}).get('content')
+                    if delta:
+                        yield delta
+                else:
+                    # Without the [DONE] sentinel the text may be cut short; don't let it pass as complete
+                    logger.error(f"{self.tool_name} stream ended before [DONE]")
+                    raise AIResponseError("Error: The AI response stream ended before it was complete.")
+        except requests.exceptions.HTTPError as e:
+            error_msg = f"API Request Error: {e}\nResponse: {e.response.text}"
+            logger.error(error_msg)
+            raise AIResponseError(error_msg) from e
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Network Error: {e}")
+            raise AIResponseError(f"Network Error: {e}") from e
+        except (KeyError, IndexError, AttributeError, TypeError, json.JSONDecodeError) as e:
+            logger.error(f"Error parsing AI stream: {e}", exc_info=True)
+            raise AIResponseError(f"Error parsing AI response: {e}") from e
+
+    def _prepare_rest_request(self, prompt, settings, api_key):
+        """Builds the (url, headers, payload) triple for a REST provider."""
+        # --- Helper to safely add params ---
+        def add_param(p_dict, key, p_type):
+            val_str = str(settings.get(key, '')).strip()
+            if val_str:
+                try:
+                    converted_val = p_type(val_str)
+                    if converted_val or isinstance(converted_val, (int, float)) and converted_val == 0:
+                       p_dict[key] = converted_val
+                except (ValueError, TypeError):
+                    logger.warning(f"Could not convert {key} value '{val_str}' to {p_type}")
+
+        # --- Get URL and Headers ---
+        url, headers = self._get_api_endpoint_and_headers(api_key)
+
+        # --- Build Payload ---
+        payload = self._build_payload(prompt, settings, add_param)
+        return url, headers, payload
 
+    def _handle_rest_api(self, prompt, settings, api_key):
+        url, payload, headers = "", {}, {}
+        try:
+            url, headers, payload = self._prepare_rest_request(prompt, settings, api_key)
         except Exception as e:
             logger.error(f"Error configuring API for {self.tool_name}: {e}", exc_info=True)
-            return f"Error configuring API request: {e}"
+            raise AIResponseError(f"Error configuring API request: {e}") from e
 
         logger.debug(f"{self.tool_name} payload: {json.dumps(payload, indent=2)}")
 
         for i in range(self.MAX_RETRIES):
             try:
-                response = requests.post(url, json=payload, headers=headers, timeout=60)
+                response = self.session.post(url, json=payload, headers=headers, timeout=60)
                 response.raise_for_status()
                 data = response.json()
                 logger.debug(f"{self.tool_name} Response: {data}")
@@ -205,16 +302,16 @@ class AIManager:
                 else:
                     error_msg = f"API Request Error: {e}\nResponse: {e.response.text}"
                     logger.error(error_msg)
-                    return error_msg
+                    raise AIResponseError(error_msg) from e
             except requests.exceptions.RequestException as e:
                 logger.error(f"Network Error: {e}")
-                return f"Network Error: {e}"
+                raise AIResponseError(f"Network Error: {e}") from e
             except (KeyError, IndexError, json.JSONDecodeError) as e:
                 resp_text = response.text if 'response' in locals() else 'N/A'
                 logger.error(f"Error parsing AI response: {e}\nResponse:\n{resp_text}", exc_info=True)
-                return f"Error parsing AI response: {e}\nResponse:\n{resp_text}"
+                raise AIResponseError(f"Error parsing AI response: {e}\nResponse:\n{resp_text}") from e
 
-        return "Error: Max retries exceeded. The API is still busy."
+        raise AIResponseError("Error: Max retries exceeded. The API is still busy.")
 
     def _get_api_endpoint_and_headers(self, api_key):
         if self.tool_name == "Google AI":
@@ -302,15 +399,17 @@ class AIManager:
         return payload
 
     def _parse_response(self, data: dict) -> str:
-        result_text = f"Error: Could not parse response from {self.tool_name}."
+        result_text = None
         if self.tool_name == "Google AI":
-            return data.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', result_text)
+            result_text = data.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text')
         elif self.tool_name == "Anthropic AI":
-            return data.get('content', [{}])[0].get('text', result_text)
+            result_text = data.get('content', [{}])[0].get('text')
         elif self.tool_name in ["OpenAI", "Groq AI", "OpenRouterAI"]:
-            return data.get('choices', [{}])[0].get('message', {}).get('content', result_text)
+            result_text = data.get('choices', [{}])[0].get('message', {}).get('content')
         elif self.tool_name == "Cohere AI":
-            return data.get('text', result_text)
+            result_text = data.get('text')
+        if result_text is None:
+            raise AIResponseError(f"Error: Could not parse response from {self.tool_name}.")
         return result_text
 
 
@@ -23,7 +23,7 @@ if errorlevel 1 (
 
 REM Install required dependencies
 echo Installing required dependencies...
-pip install pandas reportlab python-docx wordcloud requests huggingface_hub
+pip install reportlab python-docx wordcloud requests huggingface_hub
 
 REM Create executable with PyInstaller
 echo Creating executable...
@@ -2,50 +2,54 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
 import sqlite3
 import json
+import csv
+import hashlib
+import importlib.util
 import os
 import logging
 import threading
+import time
+import queue
 from datetime import datetime
 import webbrowser
 import re
-from collections import Counter
-import shutil
+from collections import Counter, OrderedDict, deque
 from pathlib import Path
 import sys
 from contextlib import contextmanager
+from itertools import islice
+from functools import lru_cache
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any, Tuple, Generator
+from typing import Optional, List, Dict, Any, Tuple, Generator, Iterable, Deque, Callable
 from concurrent.futures import ThreadPoolExecutor, Future
 
 # Import AI APIs
-from ai_apis import AIManager
+from ai_apis import AIManager, AIResponseError
 
-# Import additional libraries
-try:
-    from wordcloud import WordCloud
-    WORDCLOUD_AVAILABLE = True
-except ImportError:
-    WORDCLOUD_AVAILABLE = False
-    
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+# Optional export/suggestion libraries are heavy to import, so only probe for them here
+# and import them inside the functions that use them.
+WORDCLOUD_AVAILABLE = importlib.util.find_spec('wordcloud') is not None
+REPORTLAB_AVAILABLE = importlib.util.find_spec('reportlab') is not None
+DOCX_AVAILABLE = importlib.util.find_spec('docx') is not None
 
 try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-    from reportlab.lib.styles import getSampleStyleSheet
-    REPORTLAB_AVAILABLE = True
+    # Faster parsing of stored tag lists; orjson.JSONDecodeError subclasses json.JSONDecodeError
+    import orjson
+    json_loads = orjson.loads
 except ImportError:
-    REPORTLAB_AVAILABLE = False
+    json_loads = json.loads
 
-try:
-    from docx import Document
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
+# Tags are stored as compact JSON with non-ASCII kept as-is, so FTS indexes the real characters
+# instead of \uXXXX escapes; rows written with json.dumps' default format still parse the same
+_encode_tags = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+
+# Patterns used on keystroke/selection hot paths, compiled once at import
+_SENTENCE_RE = re.compile(r'[.!?]+')
+_URL_RE = re.compile(r'https?://[^\s\n]+')
+_TAG_WORD_RE = re.compile(r'\b\w{3,}\b')
+_FTS_TOKEN_RE = re.compile(r'\w+')
+_FTS_TAGS_FILTER_RE = re.compile(r'\s*Tags\s*:', re.IGNORECASE)
+_TAG_STOPWORDS = frozenset({'the', 'and', 'for', 'with', 'this', 'that', 'are', 'was'})
 
 
 @dataclass
@@ -72,6 +76,7 @@ class SettingsManager:
             'ai_provider': 'OpenAI',
             'ai_api_key': '',
             'log_level': 'INFO',
+            'ai_cache_enabled': True,
             'window_geometry': '1200x800+100+100'
         }
 
@@ -110,7 +115,106 @@ class SettingsManager:
         self.save()
 
 
+class FormStatusBinder:
+    """Keeps a form text widget's line numbers and statistics label in sync, throttled on Tk's <<Modified>>."""
+    def __init__(self, app: 'PromptMiniApp', text_widget: tk.Text, line_numbers: tk.Text,
+                 status_label: ttk.Label, delay_ms: int = 150):
+        self.app = app
+        self.text_widget: Optional[tk.Text] = text_widget
+        self.line_numbers = line_numbers
+        self.status_label = status_label
+        self.delay_ms = delay_ms
+        self._timer: Optional[str] = None
+        # <<Modified>> fires only when the modified flag flips, i.e. on the first edit since the last
+        # refresh; it also covers paste, drag-and-drop and programmatic inserts that <KeyRelease> missed
+        text_widget.bind('<<Modified>>', self._on_modified, add='+')
+        text_widget.bind('<Destroy>', self._teardown, add='+')
+        self.refresh(force=True)
+
+    def _on_modified(self, event: tk.Event) -> None:
+        """Schedule one recomputation for the edits made within the next delay_ms."""
+        if self.text_widget is None or self._timer or not self.text_widget.edit_modified():
+            return
+        self._timer = self.app.root.after(self.delay_ms, self.refresh)
+
+    def refresh(self, force: bool = False) -> None:
+        """Recompute line numbers and statistics, unless the text is unchanged since the last refresh."""
+        self._timer = None
+        if self.text_widget is None:
+            return
+        if not force and not self.text_widget.edit_modified():
+            return
+        # Re-arm <<Modified>> for the next edit
+        self.text_widget.edit_modified(False)
+        text = self.text_widget.get(1.0, tk.END)
+        self.app.update_form_line_numbers(self.line_numbers, text)
+        self.app.update_form_status_label(self.status_label, text)
+
+    def _teardown(self, event: tk.Event) -> None:
+        """Cancel any pending refresh and drop widget references once the text widget is destroyed."""
+        if event.widget is not self.text_widget:
+            return
+        if self._timer:
+            self.app.root.after_cancel(self._timer)
+            self._timer = None
+        self.text_widget = self.line_numbers = self.status_label = None
+
+
 class PromptMiniApp:
+    # Bump whenever the FTS table or its triggers change so init_database rebuilds them once.
+    FTS_SCHEMA_VERSION = 4
+    DB_PATH = 'prompt_mini.db'
+    # Upper bound on idle read-only connections kept for SELECT-only work
+    READ_POOL_SIZE = 4
+    EXPORT_CHUNK_SIZE = 1000
+    EXPORT_BUFFER_SIZE = 1 << 20
+    # Every write path uses these exact strings, so the write connection prepares each statement once
+    INSERT_PROMPT_SQL = '''
+        INSERT INTO prompts (Created, Modified, Purpose, Prompt, SessionURLs, Tags, Note)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    '''
+    UPDATE_PROMPT_SQL = '''
+        UPDATE prompts SET Modified = ?, Purpose = ?, Prompt = ?, SessionURLs = ?, Tags = ?, Note = ?
+        WHERE id = ?
+    '''
+    # Search statements are fixed strings so each pooled connection's statement cache
+    # (cached_statements) hands back the already-prepared program on every keystroke.
+    # They select only the treeview's columns, in its column order; Prompt/SessionURLs/Note
+    # are fetched per item when it is selected.
+    SEARCH_SQL = '''
+        SELECT p.id, p.Created, p.Modified, p.Purpose, p.Tags
+        FROM prompts p JOIN prompts_fts fts ON p.id = fts.rowid
+        WHERE prompts_fts MATCH ? ORDER BY {order} LIMIT ? OFFSET ?
+    '''
+    LIST_SQL = '''
+        SELECT p.id, p.Created, p.Modified, p.Purpose, p.Tags
+        FROM prompts p ORDER BY {order} LIMIT ? OFFSET ?
+    '''
+    # 1-based position of one row under the same ordering, or no row if it is not a match
+    SEARCH_POSITION_SQL = '''
+        SELECT pos FROM (
+            SELECT p.id, ROW_NUMBER() OVER (ORDER BY {order}) AS pos
+            FROM prompts p JOIN prompts_fts fts ON p.id = fts.rowid
+            WHERE prompts_fts MATCH ?
+        ) WHERE id = ?
+    '''
+    LIST_POSITION_SQL = '''
+        SELECT pos FROM (
+            SELECT p.id, ROW_NUMBER() OVER (ORDER BY {order}) AS pos FROM prompts p
+        ) WHERE id = ?
+    '''
+    # Allowlist mapping treeview columns to ORDER BY expressions; text columns sort case-insensitively
+    SORT_COLUMNS = {
+        'ID': 'p.id', 'Created': 'p.Created', 'Modified': 'p.Modified',
+        'Purpose': 'p.Purpose COLLATE NOCASE', 'Tags': 'p.Tags COLLATE NOCASE',
+    }
+    # Rows per search page; the next page loads when the list is scrolled near its end
+    SEARCH_PAGE_SIZE = 500
+    TREE_VALUES_CACHE_SIZE = 5000
+    PROMPT_CACHE_SIZE = 128
+    SEARCH_CACHE_SIZE = 32
+    STATEMENT_CACHE_SIZE = 128
+
     def __init__(self) -> None:
         self.root = tk.Tk()
         self.root.title("Prompt Mini")
@@ -122,11 +226,28 @@ class PromptMiniApp:
         
         self.setup_logging()
         self.apply_log_level()
+        self._read_pool: queue.Queue = queue.Queue(maxsize=self.READ_POOL_SIZE)
+        # One long-lived write connection, serialized by a lock so worker threads can share it
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.RLock()
         self.init_database()
         
         self.search_debounce_timer: Optional[str] = None
-        self.text_debounce_timer: Optional[str] = None
-        
+        self.last_search_input: float = 0.0
+        self.status_reset_timer: Optional[str] = None
+        
+        self.search_results: List[sqlite3.Row] = []
+        # id -> row for the loaded results, so tooltip lookups on mouse motion don't scan the list
+        self.search_results_by_id: Dict[int, sqlite3.Row] = {}
+        # First result page per (normalized query, order, prompts_version); any prompt write changes the key
+        self.search_cache: 'OrderedDict[Tuple[Optional[str], str, int], Tuple[sqlite3.Row, ...]]' = OrderedDict()
+        # Paging state for search_results: the term it was loaded for, whether more pages exist,
+        # and a generation counter so a stale page load cannot land in a newer search
+        self.search_results_term: str = ""
+        self.search_results_order: str = ""
+        self.search_has_more: bool = False
+        self.search_loading_more: bool = False
+        self.search_generation: int = 0
         self.selected_items: List[int] = []
         self.current_item: Optional[int] = None
         
@@ -137,12 +258,45 @@ class PromptMiniApp:
         self.sort_column: Optional[str] = None
         self.sort_direction: Optional[str] = None
         
-        self.prompt_cache: Dict[int, Tuple] = {}
+        # Last options applied to each action button, keyed by widget path
+        self._button_options: Dict[str, Dict[str, str]] = {}
+        # Whether the toolbar is currently packed for editing (True), viewing (False) or not yet at all (None)
+        self._packed_edit_layout: Optional[bool] = None
+        
+        # Bumped after every committed write to prompts; prompt_cache and search_cache entries are
+        # stamped with it, so other writes (e.g. the AI response cache) leave them valid
+        self.prompts_version = 0
+        # Full rows of recently viewed prompts, least recently used first, each stamped with the
+        # prompts_version it was read at; an entry from before any later prompt write is refetched
+        self.prompt_cache: 'OrderedDict[int, Tuple[int, sqlite3.Row]]' = OrderedDict()
+        # Formatted treeview values keyed by (id, Modified); edited rows get a new key, so no invalidation is needed
+        self.tree_values_cache: Dict[Tuple[int, str], Tuple] = {}
+        # Line count currently rendered in each line-number gutter (display panel, forms, AI windows), keyed by widget path
+        self.form_line_counts: Dict[str, int] = {}
+        # (id, Modified) of the row in the display panel and the text last written to each widget
+        self._displayed_key: Optional[Tuple[int, str]] = None
+        self._rendered_fields: Dict[str, str] = {}
         self.logger.info("Initialized prompt cache")
         
+        # AI managers (and their HTTP sessions) keyed by (provider, api_key); used from worker threads
+        self.ai_managers: Dict[Tuple[str, str], AIManager] = {}
+        self.ai_managers_lock = threading.Lock()
+        # Provider defaults are static; read-only for the UI, built once instead of per trace event
+        self.ai_defaults: Dict[str, Dict[str, Any]] = AIManager._get_default_settings()
+        
         # Thread pool for cancellable searches
         self.search_executor = ThreadPoolExecutor(max_workers=1)
+        # Reused worker threads for AI generations
+        self.ai_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='ai')
+        # Exports stream rows from pooled read connections off the Tk thread; one at a time
+        self.export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='export')
         self.current_search_future: Optional[Future] = None
+        self.export_in_progress = False
+
+        # Dialogs that are hidden on close and shown again instead of being rebuilt
+        self.log_window: Optional[tk.Toplevel] = None
+        self.models_dialog: Optional[tk.Toplevel] = None
+        self.models_dialog_state: Dict[str, Any] = {}
         
         self.create_menu()
         self.create_main_ui()
@@ -162,7 +316,11 @@ class PromptMiniApp:
         self.logger.setLevel(logging.DEBUG)
         self.logger.addHandler(self.log_handler)
         
-        self.log_messages: List[Tuple[int, str]] = []
+        self.log_messages: Deque[Tuple[int, str]] = deque(maxlen=1000)
+        # Total ever logged; lets viewers tell which deque entries are new after old ones roll off
+        self.log_message_total = 0
+        # Set while a console-log refresh is queued, so a burst of records schedules a single redraw
+        self.log_refresh_pending = False
         
         class LogCapture(logging.Handler):
             def __init__(self, app: 'PromptMiniApp'):
@@ -172,19 +330,35 @@ class PromptMiniApp:
             def emit(self, record: logging.LogRecord) -> None:
                 msg = self.format(record)
                 self.app.log_messages.append((record.levelno, msg))
-                if len(self.app.log_messages) > 1000:
-                    self.app.log_messages = self.app.log_messages[-500:]
+                self.app.log_message_total += 1
+
+                # A Tk call from a worker blocks until the main thread services it, which deadlocks if the
+                # main thread is waiting on a lock the worker holds; the console window picks these records
+                # up on its next refresh
+                if threading.current_thread() is not threading.main_thread():
+                    return
+
+                if getattr(self.app, 'log_window', None) is not None and not self.app.log_refresh_pending:
+                    self.app.log_refresh_pending = True
+                    self.app.root.after_idle(self.app.refresh_console_log)
                 
                 if hasattr(self.app, 'status_bar'):
-                    parts = msg.split(' - ')
-                    if len(parts) >= 3:
-                        status_msg = parts[-1].strip()
+                    # The status bar only shows the message itself, so skip re-parsing the formatted line
+                    status_msg = record.getMessage().strip()
+                    if status_msg:
                         self.app.update_status_bar(status_msg)
         
         self.log_capture = LogCapture(self)
         self.log_capture.setFormatter(formatter)
         self.logger.addHandler(self.log_capture)
         
+    def refresh_console_log(self) -> None:
+        """Append records logged since the last refresh to the console log window, if it is showing."""
+        self.log_refresh_pending = False
+        # A hidden window catches up when show_console_log() deiconifies it
+        if self.log_window is not None and self.log_window.winfo_exists() and self.log_window.winfo_viewable():
+            self.log_window.event_generate('<<RefreshLog>>')
+
     def apply_log_level(self) -> None:
         """Apply the log level from settings."""
         level_map = {
@@ -197,7 +371,7 @@ class PromptMiniApp:
         self.log_handler.setLevel(level)
             
     def auto_size_window(self, window: tk.Toplevel, min_width: int = 800, min_height: int = 600, show_window: bool = True) -> None:
-        """Automatically size a window to fit content with minimum dimensions."""
+        """Size a (still withdrawn) window to fit its content, then map it once at its final geometry."""
         window.update_idletasks()
         
         screen_width = window.winfo_screenwidth()
@@ -222,27 +396,84 @@ class PromptMiniApp:
             
     @contextmanager
     def get_db_connection(self) -> Generator[sqlite3.Connection, None, None]:
-        """Provide a managed database connection."""
-        conn = None
+        """Provide the shared read-write connection, held exclusively for the duration of the block."""
+        try:
+            with self._write_lock:
+                if self._write_conn is None:
+                    conn = sqlite3.connect(self.DB_PATH, timeout=10.0, check_same_thread=False,
+                                           cached_statements=self.STATEMENT_CACHE_SIZE)
+                    conn.row_factory = sqlite3.Row
+                    conn.execute('PRAGMA foreign_keys = ON')
+                    # WAL is persistent (set in init_database); NORMAL sync is durable enough under WAL
+                    conn.execute('PRAGMA synchronous = NORMAL')
+                    self._apply_performance_pragmas(conn)
+                    self._write_conn = conn
+                conn = self._write_conn
+                try:
+                    yield conn
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    # Closing used to discard uncommitted work; keep that so no transaction outlives the block
+                    if conn.in_transaction:
+                        conn.rollback()
+        except Exception as e:
+            # Log only once the lock is released: the log handler may need the Tk main thread,
+            # which could itself be waiting on this lock
+            self.logger.error(f"Database connection error: {e}")
+            raise
+
+    def close_db_connection(self) -> None:
+        """Close the shared write connection; the next get_db_connection() reopens it."""
+        with self._write_lock:
+            if self._write_conn is not None:
+                self._write_conn.close()
+                self._write_conn = None
+
+    @contextmanager
+    def get_read_connection(self) -> Generator[sqlite3.Connection, None, None]:
+        """Borrow a pooled read-only connection; safe to use from worker threads."""
         try:
-            conn = sqlite3.connect('prompt_mini.db', timeout=10.0)
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(f'file:{self.DB_PATH}?mode=ro', uri=True, timeout=10.0, check_same_thread=False,
+                                   cached_statements=self.STATEMENT_CACHE_SIZE)
             conn.row_factory = sqlite3.Row
-            conn.execute('PRAGMA foreign_keys = ON')
-            conn.execute('PRAGMA journal_mode=WAL')
+            self._apply_performance_pragmas(conn)
+        try:
             yield conn
         except Exception as e:
-            self.logger.error(f"Database connection error: {e}")
-            if conn:
-                conn.rollback()
+            self.logger.error(f"Database read error: {e}")
             raise
         finally:
-            if conn:
+            try:
+                self._read_pool.put_nowait(conn)
+            except queue.Full:
                 conn.close()
 
+    @staticmethod
+    def _apply_performance_pragmas(conn: sqlite3.Connection) -> None:
+        """Apply per-connection cache, temp-store and memory-map tuning."""
+        conn.execute('PRAGMA temp_store = MEMORY')
+        conn.execute('PRAGMA cache_size = -64000')  # ~64 MB page cache
+        conn.execute('PRAGMA mmap_size = 268435456')  # 256 MB
+
+    def close_read_connections(self) -> None:
+        """Close all idle pooled read connections (e.g. before the database file is replaced)."""
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
+
     def init_database(self) -> None:
         """Initialize the SQLite database and Full-Text Search (FTS5) table."""
         try:
             with self.get_db_connection() as conn:
+                conn.execute('PRAGMA journal_mode = WAL')
+                # One transaction for all schema work and the rebuild so it syncs once
+                conn.execute('BEGIN IMMEDIATE')
                 conn.execute('''
                     CREATE TABLE IF NOT EXISTS prompts (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -255,40 +486,71 @@ class PromptMiniApp:
                         Note TEXT
                     )
                 ''')
-                
+                # Backs the ORDER BY Modified DESC of the unfiltered listing and tag suggestions
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_prompts_modified ON prompts(Modified DESC)')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS ai_cache (
+                        key TEXT PRIMARY KEY,
+                        response TEXT NOT NULL,
+                        created DATETIME DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+
+                schema_version = conn.execute('PRAGMA user_version').fetchone()[0]
+                fts_exists = conn.execute(
+                    "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = 'prompts_fts'"
+                ).fetchone()[0]
+                if fts_exists and schema_version >= self.FTS_SCHEMA_VERSION:
+                    conn.commit()
+                    self.logger.info("Database initialized successfully (FTS index up to date)")
+                    return
+
                 # Drop legacy triggers and FTS table to ensure schema is correct
                 for trigger in ['prompts_after_insert', 'prompts_after_delete', 'prompts_after_update', 'prompts_ai', 'prompts_ad', 'prompts_au']:
                     conn.execute(f'DROP TRIGGER IF EXISTS {trigger}')
                 conn.execute('DROP TABLE IF EXISTS prompts_fts')
-                
+
                 conn.execute('''
                     CREATE VIRTUAL TABLE prompts_fts USING fts5(
-                        Purpose, Prompt, SessionURLs, Tags, Note,
+                        Purpose, Prompt, SessionURLs UNINDEXED, Tags, Note,
                         content='prompts',
-                        content_rowid='id'
+                        content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2',
+                        prefix='2 3 4'
                     )
                 ''')
+                # Persisted bm25 weights (Purpose, Prompt, SessionURLs, Tags, Note) used by ORDER BY rank
+                conn.execute("INSERT INTO prompts_fts(prompts_fts, rank) VALUES('rank', 'bm25(10.0, 2.0, 1.0, 5.0, 1.0)')")
                 
-                conn.executescript('''
+                conn.execute('''
                     CREATE TRIGGER IF NOT EXISTS prompts_after_insert AFTER INSERT ON prompts BEGIN
                         INSERT INTO prompts_fts(rowid, Purpose, Prompt, SessionURLs, Tags, Note)
                         VALUES (new.id, new.Purpose, new.Prompt, new.SessionURLs, new.Tags, new.Note);
-                    END;
+                    END
+                ''')
+                conn.execute('''
                     CREATE TRIGGER IF NOT EXISTS prompts_after_delete AFTER DELETE ON prompts BEGIN
                         INSERT INTO prompts_fts(prompts_fts, rowid, Purpose, Prompt, SessionURLs, Tags, Note)
                         VALUES ('delete', old.id, old.Purpose, old.Prompt, old.SessionURLs, old.Tags, old.Note);
-                    END;
-                    CREATE TRIGGER IF NOT EXISTS prompts_after_update AFTER UPDATE ON prompts BEGIN
+                    END
+                ''')
+                conn.execute('''
+                    CREATE TRIGGER IF NOT EXISTS prompts_after_update AFTER UPDATE ON prompts
+                    WHEN new.Purpose IS NOT old.Purpose OR new.Prompt IS NOT old.Prompt
+                        OR new.SessionURLs IS NOT old.SessionURLs OR new.Tags IS NOT old.Tags
+                        OR new.Note IS NOT old.Note
+                    BEGIN
                         INSERT INTO prompts_fts(prompts_fts, rowid, Purpose, Prompt, SessionURLs, Tags, Note)
                         VALUES ('delete', old.id, old.Purpose, old.Prompt, old.SessionURLs, old.Tags, old.Note);
                         INSERT INTO prompts_fts(rowid, Purpose, Prompt, SessionURLs, Tags, Note)
                         VALUES (new.id, new.Purpose, new.Prompt, new.SessionURLs, new.Tags, new.Note);
-                    END;
+                    END
                 ''')
                 
                 conn.execute('INSERT INTO prompts_fts(prompts_fts) VALUES("rebuild")')
+                conn.execute(f'PRAGMA user_version = {self.FTS_SCHEMA_VERSION}')
                 conn.commit()
-            self.logger.info("Database initialized successfully")
+            self.logger.info("Database initialized successfully (FTS index rebuilt)")
         except Exception as e:
             self.logger.error(f"Database initialization error: {e}")
             messagebox.showerror("Database Error", f"Failed to initialize database: {e}")    
@@ -298,7 +560,7 @@ class PromptMiniApp:
         menubar = tk.Menu(self.root)
         self.root.config(menu=menubar)
         
-        file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu = self.file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Export Location", command=self.set_export_location)
         file_menu.add_separator()
@@ -323,6 +585,11 @@ class PromptMiniApp:
         settings_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Settings", menu=settings_menu)
         settings_menu.add_command(label="Console Log", command=self.show_console_log)
+        settings_menu.add_separator()
+        self.ai_cache_var = tk.BooleanVar(value=self.settings_manager.get('ai_cache_enabled', True))
+        settings_menu.add_checkbutton(label="Cache AI Responses", variable=self.ai_cache_var,
+                                      command=lambda: self.settings_manager.set('ai_cache_enabled', self.ai_cache_var.get()))
+        settings_menu.add_command(label="Clear AI Cache", command=self.clear_ai_cache)
         
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Help", menu=help_menu)
@@ -367,12 +634,18 @@ class PromptMiniApp:
         self.tree.column('Modified', width=120, minwidth=100, stretch=False)
         self.tree.column('Purpose', width=200, minwidth=120)
         self.tree.column('Tags', width=150, minwidth=100)
+        # Inserting a page of rows one Python->Tcl call at a time dominates refresh time; loop in Tcl instead.
+        # The prompt id (first value) is the item id, so selecting a row by id needs no scan; a row that
+        # shifted across a page boundary between loads is not inserted twice.
+        self.tree.tk.eval('proc ::prompt_mini_insert_rows {tree rows} '
+                          '{ foreach values $rows { set id [lindex $values 0]; '
+                          'if {![$tree exists $id]} { $tree insert {} end -id $id -values $values } } }')
         
-        tree_scroll = ttk.Scrollbar(left_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=tree_scroll.set)
+        self.tree_scroll = ttk.Scrollbar(left_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
         
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
         self.tree.bind('<<TreeviewSelect>>', self.on_tree_select)
         self.tree.bind('<Double-1>', self.on_tree_double_click)
@@ -382,7 +655,13 @@ class PromptMiniApp:
         self.root.bind('<Control-z>', self.undo_text)
         self.root.bind('<Control-y>', self.redo_text)
         
+        # Created on first use and then only withdrawn/re-shown
         self.tooltip: Optional[tk.Toplevel] = None
+        self.tooltip_label: Optional[ttk.Label] = None
+        # Motion events are coalesced to one tooltip update per frame, and skipped while the cell is unchanged
+        self.tree_motion_timer: Optional[str] = None
+        self.tree_motion_coords: Tuple[int, int, int, int] = (0, 0, 0, 0)
+        self.last_motion_cell: Tuple[str, str] = ("", "")
         
         right_frame = ttk.Frame(self.paned_window)
         self.paned_window.add(right_frame, weight=3)
@@ -409,13 +688,21 @@ class PromptMiniApp:
         self.status_bar = ttk.Label(self.root, text="Ready", relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=2)
         
+    def _reset_status_bar(self) -> None:
+        """Return the status bar to its idle/editing text once a transient message has expired."""
+        self.status_reset_timer = None
+        self.update_status_bar()
+
     def update_status_bar(self, message: str = None) -> None:
         """Update the status bar with a message or unsaved changes indicator."""
         if hasattr(self, 'status_bar'):
             if message:
                 self.status_bar.config(text=message, font=('TkDefaultFont', 9, 'normal'))
                 if not message.startswith("EDITING MODE"):
-                    self.root.after(5000, lambda: self.update_status_bar())
+                    # Restart the reset countdown instead of stacking one timer per message
+                    if self.status_reset_timer:
+                        self.root.after_cancel(self.status_reset_timer)
+                    self.status_reset_timer = self.root.after(5000, self._reset_status_bar)
             elif self.editing_mode and self.has_unsaved_changes:
                 self.status_bar.config(text="EDITING MODE - PROMPT NEEDS TO BE SAVED", font=('TkDefaultFont', 9, 'bold'))
             elif self.editing_mode:
@@ -460,7 +747,7 @@ class PromptMiniApp:
         
         text_frame = ttk.Frame(prompt_frame)
         text_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
-        self.prompt_display = tk.Text(text_frame, wrap=tk.WORD, state='disabled', undo=True, maxundo=50)
+        self.prompt_display = tk.Text(text_frame, wrap=tk.WORD, state='disabled', undo=False, maxundo=50)
         prompt_scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL)
         self.prompt_display.config(yscrollcommand=lambda *args: self.sync_scroll(prompt_scrollbar, self.line_numbers, *args))
         prompt_scrollbar.config(command=lambda *args: self.sync_scroll_command(self.prompt_display, self.line_numbers, *args))
@@ -478,26 +765,53 @@ class PromptMiniApp:
         tune_btn.pack(side=tk.RIGHT)
         
         ttk.Label(parent, text="Session URLs", font=('TkDefaultFont', 9, 'bold')).pack(anchor=tk.W, pady=(0, 2))
-        self.urls_display = scrolledtext.ScrolledText(parent, height=7, state='disabled', undo=True, maxundo=50)
+        self.urls_display = scrolledtext.ScrolledText(parent, height=7, state='disabled', undo=False, maxundo=50)
         self.urls_display.pack(fill=tk.X, pady=(0, 5))
+        self.urls_display.tag_config("url", foreground="blue", underline=True)
+        self.urls_display.tag_bind("url", "<Enter>", self.on_url_enter)
+        self.urls_display.tag_bind("url", "<Leave>", self.on_url_leave)
+        self.urls_display.tag_bind("url", "<Button-1>", self.on_url_click)
         
         ttk.Label(parent, text="Tags", font=('TkDefaultFont', 9, 'bold')).pack(anchor=tk.W, pady=(0, 2))
         self.tags_display = ttk.Frame(parent)
         self.tags_display.pack(fill=tk.X, pady=(0, 5))
+        # Tag buttons share one style and are pooled across selections by update_tags_display
+        ttk.Style(self.root).configure('Tag.TButton', padding=2)
+        self.tag_buttons: List[ttk.Button] = []
         
         ttk.Label(parent, text="Note", font=('TkDefaultFont', 9, 'bold')).pack(anchor=tk.W, pady=(0, 2))
-        self.note_display = scrolledtext.ScrolledText(parent, height=0, state='disabled', undo=True, maxundo=50)
+        self.note_display = scrolledtext.ScrolledText(parent, height=0, state='disabled', undo=False, maxundo=50)
         self.note_display.pack(fill=tk.BOTH, expand=True, pady=(0, 5))       
 
     def on_search_change(self, *args: Any) -> None:
-        """Handle search input changes with debouncing."""
+        """Handle search input changes with a leading+trailing throttle."""
         if self.search_debounce_timer:
             self.root.after_cancel(self.search_debounce_timer)
-        self.search_debounce_timer = self.root.after(300, lambda: self.perform_search())
+            self.search_debounce_timer = None
+
+        now = time.monotonic()
+        is_first_keystroke = now - self.last_search_input >= 0.5
+        self.last_search_input = now
+
+        term = self.effective_search_term()
+        if term == self.search_results_term and (self.current_search_future is None or self.current_search_future.done()):
+            return  # Only whitespace (or a lone character) changed; the loaded results already answer this
+
+        if is_first_keystroke:
+            self.perform_search()
+        else:
+            delay = 500 if len(term) < 3 else 150
+            self.search_debounce_timer = self.root.after(delay, lambda: self.perform_search())
         
+    def effective_search_term(self) -> str:
+        """Return the search box text to query; a single character lists everything instead."""
+        term = self.search_var.get().strip()
+        # A one-character prefix query matches nearly every row, so show the plain listing until more is typed
+        return "" if len(term) == 1 else term
+
     def perform_search(self, select_item_id: Optional[int] = None, select_first: bool = False) -> None:
         """Perform a cancellable search using a thread pool."""
-        search_term = self.search_var.get().strip()
+        search_term = self.effective_search_term()
         
         if self.current_search_future and not self.current_search_future.done():
             self.current_search_future.cancel()
@@ -507,33 +821,129 @@ class PromptMiniApp:
             self.root.config(cursor="wait")
             self.root.update_idletasks()
         
-        def search_worker(term: str) -> List[Tuple]:
-            try:
-                with self.get_db_connection() as conn:
-                    if term:
-                        cursor = conn.execute('''
-                            SELECT p.id, p.Created, p.Modified, p.Purpose, p.Prompt, p.SessionURLs, p.Tags, p.Note
-                            FROM prompts p JOIN prompts_fts fts ON p.id = fts.rowid
-                            WHERE prompts_fts MATCH ? ORDER BY rank
-                        ''', (term + '*',))
-                    else:
-                        cursor = conn.execute('''
-                            SELECT id, Created, Modified, Purpose, Prompt, SessionURLs, Tags, Note
-                            FROM prompts ORDER BY Modified DESC
-                        ''')
-                    return cursor.fetchall()
-            except Exception as e:
-                self.logger.error(f"Search worker error: {e}")
-                return []
+        order = self.search_order_clause(search_term)
+        self.search_generation += 1
+        self.search_loading_more = False
+
+        # None marks the full listing; input with no searchable words maps to "" and matches nothing
+        cache_key = (self.build_fts_query(search_term).lower() if search_term else None, order, self.prompts_version)
+        cached = self.search_cache.get(cache_key)
+        if cached is not None:
+            self.search_cache.move_to_end(cache_key)
+            self.current_search_future = Future()
+            self.current_search_future.set_result(list(cached))
+            self._handle_search_results(self.current_search_future, search_term, order, select_item_id, select_first)
+            return
 
-        self.current_search_future = self.search_executor.submit(search_worker, search_term)
+        self.current_search_future = self.search_executor.submit(self._fetch_search_page, search_term, order, 0)
         self.current_search_future.add_done_callback(
-            lambda future: self.root.after(0, lambda: self._handle_search_results(future, select_item_id, select_first))
+            lambda future: self.root.after(0, lambda: self._handle_search_results(future, search_term, order, select_item_id, select_first, cache_key))
         )
+
+    def prompts_changed(self) -> None:
+        """Invalidate cached prompt rows and search pages; call once a write to prompts has committed."""
+        self.prompts_version += 1
+
+    def search_order_clause(self, term: str) -> str:
+        """Build the ORDER BY expression for the active column sort, or the default ordering."""
+        if self.sort_column in self.SORT_COLUMNS and self.sort_direction in ('asc', 'desc'):
+            direction = self.sort_direction.upper()
+            # id breaks ties so OFFSET paging never repeats or skips rows
+            return f"{self.SORT_COLUMNS[self.sort_column]} {direction}, p.id {direction}"
+        return 'rank' if term else 'p.Modified DESC'
+
+    def _fetch_search_page(self, term: str, order: str, offset: int, limit: Optional[int] = None) -> List[sqlite3.Row]:
+        """Fetch one page (or limit rows) of search or full-listing results; runs on the search executor."""
+        limit = limit or self.SEARCH_PAGE_SIZE
+        try:
+            with self.get_read_connection() as conn:
+                if term:
+                    fts_query = self.build_fts_query(term)
+                    if not fts_query:
+                        return []
+                    cursor = conn.execute(self.SEARCH_SQL.format(order=order), (fts_query, limit, offset))
+                else:
+                    cursor = conn.execute(self.LIST_SQL.format(order=order), (limit, offset))
+                return cursor.fetchall()
+        except Exception as e:
+            self.logger.error(f"Search worker error: {e}")
+            return []
+
+    def _fetch_pages_through_item(self, term: str, order: str, offset: int, item_id: int) -> List[sqlite3.Row]:
+        """Fetch the pages after offset up to the one holding item_id, or [] if it is not a (further) match."""
+        try:
+            with self.get_read_connection() as conn:
+                if term:
+                    fts_query = self.build_fts_query(term)
+                    if not fts_query:
+                        return []
+                    found = conn.execute(self.SEARCH_POSITION_SQL.format(order=order), (fts_query, item_id)).fetchone()
+                else:
+                    found = conn.execute(self.LIST_POSITION_SQL.format(order=order), (item_id,)).fetchone()
+        except Exception as e:
+            self.logger.error(f"Search worker error: {e}")
+            return []
+        if found is None or found[0] <= offset:
+            return []
+        end = -(-found[0] // self.SEARCH_PAGE_SIZE) * self.SEARCH_PAGE_SIZE
+        return self._fetch_search_page(term, order, offset, end - offset)
+
+    @staticmethod
+    def build_fts_query(term: str) -> str:
+        """Turn free-form input into an FTS5 query: every word becomes a quoted prefix term, ANDed together.
+
+        Quoting keeps punctuation and FTS5 operators typed by the user from being parsed as query syntax.
+        A leading "Tags:" (as set by search_by_tag) restricts the terms to the Tags column.
+        """
+        tags_filter = _FTS_TAGS_FILTER_RE.match(term)
+        if tags_filter:
+            term = term[tags_filter.end():]
+        query = ' '.join(f'"{token}"*' for token in _FTS_TOKEN_RE.findall(term))
+        return f'Tags : ({query})' if tags_filter and query else query
+
+    def on_tree_scroll(self, first: str, last: str) -> None:
+        """Forward treeview scrolling to the scrollbar and load the next page near the end of the list."""
+        self.tree_scroll.set(first, last)
+        if float(last) > 0.9 and self.search_has_more and not self.search_loading_more:
+            self.load_more_results()
+
+    def load_more_results(self, through_item_id: Optional[int] = None) -> None:
+        """Append the next page of results for the current search.
+
+        With through_item_id, append every page up to the one holding that item and then select it,
+        falling back to the first row if it is not a match.
+        """
+        self.search_loading_more = True
+        generation = self.search_generation
+        term, order, offset = self.search_results_term, self.search_results_order, len(self.search_results)
+        if through_item_id is None:
+            future = self.search_executor.submit(self._fetch_search_page, term, order, offset)
+        else:
+            future = self.search_executor.submit(self._fetch_pages_through_item, term, order, offset, through_item_id)
+
+        def handle_page() -> None:
+            if future.cancelled() or generation != self.search_generation:
+                return
+            self.search_loading_more = False
+            rows = future.result()
+            # Whole pages are fetched, so a short one is the last
+            if through_item_id is None or rows:
+                self.search_has_more = bool(rows) and len(rows) % self.SEARCH_PAGE_SIZE == 0
+            if rows:
+                self.search_results.extend(rows)
+                self.search_results_by_id.update((row['id'], row) for row in rows)
+                self._insert_tree_rows(rows)
+            if through_item_id is not None:
+                self._select_listed_item(through_item_id)
+
+        future.add_done_callback(lambda f: self.root.after(0, handle_page))
     
-    def _handle_search_results(self, future: Future, select_item_id: Optional[int] = None, select_first: bool = False) -> None:
+    def _handle_search_results(self, future: Future, term: str, order: str,
+                               select_item_id: Optional[int] = None, select_first: bool = False,
+                               cache_key: Optional[Tuple[Optional[str], str, int]] = None) -> None:
         """Process search results in the main UI thread."""
-        if future.cancelled():
+        # A search that was already running when a newer one was submitted still completes; drop its results
+        if future.cancelled() or future is not self.current_search_future:
             return
 
         if hasattr(self, 'status_bar'):
@@ -547,6 +957,15 @@ class PromptMiniApp:
             self.search_results = []
         else:
             self.search_results = future.result()
+            if cache_key is not None and self.search_results:
+                # Stored as a tuple: search_results itself grows as further pages load
+                self.search_cache[cache_key] = tuple(self.search_results)
+                if len(self.search_cache) > self.SEARCH_CACHE_SIZE:
+                    self.search_cache.popitem(last=False)
+        self.search_results_by_id = {row['id']: row for row in self.search_results}
+        self.search_results_term = term
+        self.search_results_order = order
+        self.search_has_more = len(self.search_results) == self.SEARCH_PAGE_SIZE
         
         self.refresh_search_view()
         
@@ -568,7 +987,8 @@ class PromptMiniApp:
             self.sort_direction = 'asc'
         
         self.update_column_headers()
-        self.refresh_search_view()
+        # Sorting happens in SQL so it covers every page, not just the rows loaded so far
+        self.perform_search(select_item_id=self.current_item)
         
     def update_column_headers(self) -> None:
         """Update treeview column headers with sort direction indicators."""
@@ -582,53 +1002,88 @@ class PromptMiniApp:
             self.tree.heading(col, text=text)
     
     def refresh_search_view(self) -> None:
-        """Refresh the search results treeview, applying sorting if active."""
+        """Rebuild the search results treeview from the loaded result rows."""
         self.tree.unbind('<<TreeviewSelect>>')
         try:
             self.tree.delete(*self.tree.get_children())
-                
-            display_results = getattr(self, 'search_results', [])
-            
-            if self.sort_column and self.sort_direction and display_results:
-                col_index = self.tree['columns'].index(self.sort_column)
-                reverse = (self.sort_direction == 'desc')
-                
-                def sort_key(row):
-                    val = row[col_index]
-                    if self.sort_column == 'ID':
-                        return int(val) if val else 0
-                    return (val or '').lower()
-
-                display_results = sorted(display_results, key=sort_key, reverse=reverse)
-                
-            if display_results:
-                for row in display_results:
-                    tags = row['Tags']
-                    tags_display = ""
-                    if tags:
-                        try:
-                            # Strip whitespace and handle potential JSON errors
-                            tag_list = [t.strip() for t in (json.loads(tags) if tags.strip().startswith('[') else tags.split(','))]
-                            tag_list = [t for t in tag_list if t]
-                            tags_display = ', '.join(tag_list[:3])
-                            if len(tag_list) > 3:
-                                tags_display += "..."
-                        except json.JSONDecodeError:
-                            self.logger.warning(f"Malformed tags JSON for item {row['id']}: {tags}")
-                            tags_display = tags[:30].strip() + "..." if len(tags) > 30 else tags.strip()
-                    
-                    self.tree.insert('', 'end', values=(
-                        row['id'],
-                        self.format_datetime(row['Created']),
-                        self.format_datetime(row['Modified']),
-                        (row['Purpose'] or '')[:50] + ("..." if len(row['Purpose'] or '') > 50 else ""),
-                        tags_display
-                    ))
+            self._insert_tree_rows(self.search_results)
         finally:
             self.tree.bind('<<TreeviewSelect>>', self.on_tree_select)
+
+    def _insert_tree_rows(self, rows: Iterable[sqlite3.Row]) -> None:
+        """Append result rows to the end of the treeview in a single Tcl call."""
+        values: List[Tuple] = []
+        for row in rows:
+            # Purpose/Tags only change together with Modified, so (id, Modified) identifies the formatted row
+            key = (row['id'], row['Modified'])
+            row_values = self.tree_values_cache.get(key)
+            if row_values is None:
+                row_values = self._format_tree_row(row)
+                if len(self.tree_values_cache) >= self.TREE_VALUES_CACHE_SIZE:
+                    del self.tree_values_cache[next(iter(self.tree_values_cache))]
+                self.tree_values_cache[key] = row_values
+            values.append(row_values)
+        if values:
+            # Tuples cross into Tcl as list objects, so no quoting is needed
+            self.tree.tk.call('::prompt_mini_insert_rows', str(self.tree), tuple(values))
                 
-    def format_datetime(self, dt_str: Optional[str]) -> str:
-        """Format a datetime string for display."""
+    def _format_tree_row(self, row: sqlite3.Row) -> Tuple:
+        """Format one result row into the treeview's column values."""
+        tags = row['Tags']
+        tags_display = ""
+        if tags:
+            try:
+                tag_list = self.parse_tags(tags)
+                tags_display = ', '.join(tag_list[:3])
+                if len(tag_list) > 3:
+                    tags_display += "..."
+            except json.JSONDecodeError:
+                self.logger.warning(f"Malformed tags JSON for item {row['id']}: {tags}")
+                tags_display = self.truncate(tags.strip(), 30)
+
+        return (
+            row['id'],
+            self.format_datetime(row['Created']),
+            self.format_datetime(row['Modified']),
+            self.truncate(row['Purpose'], 50),
+            tags_display
+        )
+
+    @staticmethod
+    def truncate(text: Optional[str], limit: int) -> str:
+        """Cut text to limit characters, marking the cut with an ellipsis."""
+        if not text:
+            return ""
+        return text[:limit] + "..." if len(text) > limit else text
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def parse_tags(tags_str: Optional[str]) -> Tuple[str, ...]:
+        """Parse stored tags (JSON list or legacy comma-separated text) into non-empty, stripped strings.
+
+        Memoized on the raw string since the same Tags value is parsed for the tree, the tag buttons
+        and editing. Raises json.JSONDecodeError for malformed JSON.
+        """
+        if not tags_str:
+            return ()
+        stripped = tags_str.strip()
+        if stripped.startswith('['):
+            return tuple(tag for tag in (str(t).strip() for t in json_loads(stripped)) if tag)
+        return tuple(tag for tag in (t.strip() for t in stripped.split(',')) if tag)
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def format_tags(cls, tags_str: Optional[str], sep: str = ", ") -> str:
+        """Join stored tags for export, falling back to the raw text when it is malformed JSON; memoized like format_datetime."""
+        try:
+            return sep.join(cls.parse_tags(tags_str))
+        except json.JSONDecodeError:
+            return tags_str or ""
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def format_datetime(dt_str: Optional[str]) -> str:
+        """Format a datetime string for display; memoized since the same rows are re-rendered on every search."""
         if not dt_str:
             return ""
         try:
@@ -639,6 +1094,10 @@ class PromptMiniApp:
         except (ValueError, TypeError):
             return dt_str
             
+    def format_timestamps(self, row: sqlite3.Row) -> str:
+        """Format a row's Created/Modified pair as the single line used by the exporters."""
+        return f"Created: {self.format_datetime(row['Created'])} | Modified: {self.format_datetime(row['Modified'])}"
+
     def on_tree_select(self, event: Optional[tk.Event]) -> None:
         """Handle selection changes in the results treeview."""
         # Don't change selection if in editing mode at all
@@ -666,9 +1125,20 @@ class PromptMiniApp:
             self.change_item_in_window()
             
     def on_tree_motion(self, event: tk.Event) -> None:
+        """Record the pointer position and schedule a tooltip update, at most one per ~16 ms."""
+        self.tree_motion_coords = (event.x, event.y, event.x_root, event.y_root)
+        if self.tree_motion_timer is None:
+            self.tree_motion_timer = self.root.after(16, self._process_tree_motion)
+
+    def _process_tree_motion(self) -> None:
         """Show tooltips for truncated text in the treeview."""
-        item = self.tree.identify_row(event.y)
-        column = self.tree.identify_column(event.x)
+        self.tree_motion_timer = None
+        x, y, x_root, y_root = self.tree_motion_coords
+        item = self.tree.identify_row(y)
+        column = self.tree.identify_column(x)
+        if (item, column) == self.last_motion_cell:
+            return
+        self.last_motion_cell = (item, column)
         
         if item and column:
             col_index = int(column.replace('#', '')) - 1
@@ -681,7 +1151,7 @@ class PromptMiniApp:
                 full_text = self.get_full_text_for_tooltip(item, col_name)
                 
                 if full_text and len(full_text) > len(str(item_values[col_index])):
-                    self.show_tooltip(event.x_root, event.y_root, full_text)
+                    self.show_tooltip(x_root, y_root, full_text)
                 else:
                     self.hide_tooltip()
             else:
@@ -691,18 +1161,34 @@ class PromptMiniApp:
             
     def on_tree_leave(self, event: tk.Event) -> None:
         """Hide tooltip when the mouse leaves the treeview."""
+        if self.tree_motion_timer:
+            self.root.after_cancel(self.tree_motion_timer)
+            self.tree_motion_timer = None
+        self.last_motion_cell = ("", "")
         self.hide_tooltip()
 
     def _select_item_in_tree(self, item_id: int) -> None:
-        """Select an item in the tree by its ID."""
-        for item in self.tree.get_children():
-            if str(self.tree.item(item)['values'][0]) == str(item_id):
-                self.tree.selection_set(item)
-                self.tree.focus(item)
-                self.tree.see(item)
-                self.on_tree_select(None)
-                return
-        self._select_first_item_in_tree()
+        """Select an item in the tree by its ID, first loading the pages up to it if needed."""
+        item_id = int(item_id)
+        if item_id not in self.search_results_by_id and self.search_has_more:
+            # After a re-sort or save the item can sit beyond the pages loaded so far
+            if self.search_loading_more:
+                generation = self.search_generation
+                self.root.after(50, lambda: generation == self.search_generation and self._select_item_in_tree(item_id))
+            else:
+                self.load_more_results(through_item_id=item_id)
+            return
+        self._select_listed_item(item_id)
+
+    def _select_listed_item(self, item_id: int) -> None:
+        """Select a loaded item by its ID (rows are inserted with it as iid), or the first row if it is not listed."""
+        iid = str(item_id)
+        if not self.tree.exists(iid):
+            return self._select_first_item_in_tree()
+        self.tree.selection_set(iid)
+        self.tree.focus(iid)
+        self.tree.see(iid)
+        self.on_tree_select(None)
 
     def _select_first_item_in_tree(self) -> None:
         """Select the first item in the tree."""
@@ -717,31 +1203,32 @@ class PromptMiniApp:
         """Retrieve the full text for a tooltip from the cached search results."""
         try:
             item_id = int(self.tree.item(item_id_str)['values'][0])
-            if hasattr(self, 'search_results'):
-                for row in self.search_results:
-                    if row['id'] == item_id:
-                        return row[column_name] or ""
-            return ""
+            row = self.search_results_by_id.get(item_id)
+            return (row[column_name] or "") if row is not None else ""
         except (ValueError, IndexError, Exception) as e:
             self.logger.error(f"Error getting tooltip text: {e}")
             return ""
             
     def show_tooltip(self, x: int, y: int, text: str) -> None:
-        """Show a tooltip window at the specified coordinates."""
-        self.hide_tooltip()
-        self.tooltip = tk.Toplevel(self.root)
-        self.tooltip.wm_overrideredirect(True)
+        """Show the tooltip window at the specified coordinates, creating it on first use."""
+        if self.tooltip is None or not self.tooltip.winfo_exists():
+            self.tooltip = tk.Toplevel(self.root)
+            self.tooltip.withdraw()
+            self.tooltip.wm_overrideredirect(True)
+            frame = ttk.Frame(self.tooltip, relief=tk.SOLID, borderwidth=1)
+            frame.pack()
+            self.tooltip_label = ttk.Label(frame, background="lightyellow", wraplength=400, justify=tk.LEFT)
+            self.tooltip_label.pack(padx=5, pady=5)
+
+        self.tooltip_label.config(text=text)
         self.tooltip.wm_geometry(f"+{x+10}+{y+10}")
-        
-        frame = ttk.Frame(self.tooltip, relief=tk.SOLID, borderwidth=1)
-        frame.pack()
-        ttk.Label(frame, text=text, background="lightyellow", wraplength=400, justify=tk.LEFT).pack(padx=5, pady=5)
+        self.tooltip.deiconify()
+        self.tooltip.lift()
         
     def hide_tooltip(self) -> None:
-        """Hide the currently visible tooltip."""
-        if self.tooltip:
-            self.tooltip.destroy()
-            self.tooltip = None
+        """Hide the tooltip window if it is showing."""
+        if self.tooltip and self.tooltip.winfo_ismapped():
+            self.tooltip.withdraw()
             
     def undo_text(self, event: tk.Event) -> str:
         """Handle Ctrl+Z for undo on the focused text widget."""
@@ -759,51 +1246,84 @@ class PromptMiniApp:
             except tk.TclError: pass
         return "break"
             
+    def get_prompt_row(self, item_id: int, force_refresh: bool = False) -> Optional[sqlite3.Row]:
+        """Return the full row for a prompt from the cache, reading and caching it on a miss."""
+        row = self.cached_prompt_row(item_id) if not force_refresh else None
+        if row:
+            self.logger.debug(f"Using cached data for item {item_id}")
+            return row
+
+        # Stamp with the version from before the read: a write racing the SELECT only causes a refetch
+        version = self.prompts_version
+        with self.get_read_connection() as conn:
+            row = conn.execute('SELECT * FROM prompts WHERE id = ?', (item_id,)).fetchone()
+        if not row: return None
+
+        self.prompt_cache[item_id] = (version, row)
+        self.prompt_cache.move_to_end(item_id)
+        if len(self.prompt_cache) > self.PROMPT_CACHE_SIZE:
+            self.prompt_cache.popitem(last=False)
+        self.logger.debug(f"Fetched and cached data for item {item_id}")
+        return row
+
+    def cached_prompt_row(self, item_id: int) -> Optional[sqlite3.Row]:
+        """Return the cached row for a prompt, or None if it is missing or older than the last prompt write."""
+        entry = self.prompt_cache.get(item_id)
+        if entry is None:
+            return None
+        version, row = entry
+        if version != self.prompts_version:
+            del self.prompt_cache[item_id]
+            return None
+        self.prompt_cache.move_to_end(item_id)
+        return row
+
     def update_item_display(self, force_refresh: bool = False) -> None:
         """Update the item display panel, using a cache for performance."""
         if not self.current_item: return
         
         try:
-            row = self.prompt_cache.get(self.current_item) if not force_refresh else None
-            if row:
-                self.logger.debug(f"Using cached data for item {self.current_item}")
-            else:
-                with self.get_db_connection() as conn:
-                    row = conn.execute('SELECT * FROM prompts WHERE id = ?', (self.current_item,)).fetchone()
-                    if not row: return
-                    
-                    if len(self.prompt_cache) > 50:
-                        del self.prompt_cache[next(iter(self.prompt_cache))]
-                    
-                    self.prompt_cache[self.current_item] = row
-                    self.logger.debug(f"Fetched and cached data for item {self.current_item}")
+            row = self.get_prompt_row(self.current_item, force_refresh)
+            if not row: return
                     
+            # Selection events can fire repeatedly for the same, unchanged row
+            displayed_key = (row['id'], row['Modified'])
+            if not force_refresh and displayed_key == self._displayed_key:
+                return
+            self._displayed_key = displayed_key
+
             self.created_label.config(text=f"Created: {self.format_datetime(row['Created'])}")
             self.modified_label.config(text=f"Modified: {self.format_datetime(row['Modified'])}")
             self.purpose_display.config(text=row['Purpose'] or "")
             
-            for widget in [self.prompt_display, self.urls_display, self.note_display]:
+            # Only rewrite text widgets whose content actually differs from what is shown
+            changed_fields = set()
+            for field, widget in [('Prompt', self.prompt_display), ('SessionURLs', self.urls_display), ('Note', self.note_display)]:
+                value = row[field] or ""
+                if not force_refresh and self._rendered_fields.get(field) == value:
+                    continue
                 widget.config(state='normal')
-                widget.delete(1.0, tk.END)
+                widget.replace(1.0, tk.END, value)
+                widget.config(state='disabled')
+                self._rendered_fields[field] = value
+                changed_fields.add(field)
 
-            if row['Prompt']: self.prompt_display.insert(1.0, row['Prompt'])
-            if row['SessionURLs']:
-                self.urls_display.insert(1.0, row['SessionURLs'])
+            if 'SessionURLs' in changed_fields and row['SessionURLs']:
                 self.make_urls_clickable()
-            if row['Note']: self.note_display.insert(1.0, row['Note'])
-            
-            for widget in [self.prompt_display, self.urls_display, self.note_display]:
-                widget.config(state='disabled')
-            
-            self.update_line_numbers(row['Prompt'] or "")
-            self.update_status(row['Prompt'] or "")
-            self.update_tags_display(row['Tags'])
+            if 'Prompt' in changed_fields:
+                self.update_line_numbers(row['Prompt'] or "")
+                self.update_status(row['Prompt'] or "")
+            if force_refresh or self._rendered_fields.get('Tags') != row['Tags']:
+                self.update_tags_display(row['Tags'])
+                self._rendered_fields['Tags'] = row['Tags']
             
         except Exception as e:
             self.logger.error(f"Error updating item display: {e}")
             
     def clear_item_display(self) -> None:
         """Clear all fields in the item display panel."""
+        self._displayed_key = None
+        self._rendered_fields.clear()
         self.created_label.config(text="Created: ")
         self.modified_label.config(text="Modified: ")
         self.purpose_display.config(text="")
@@ -812,6 +1332,7 @@ class PromptMiniApp:
             widget.config(state='normal')
             widget.delete(1.0, tk.END)
             widget.config(state='disabled')
+        self.form_line_counts[str(self.line_numbers)] = 0
         
         self.status_label.config(text="Char: 0 | Word: 0 | Sentence: 0 | Line: 0 | Tokens: 0")
         
@@ -820,13 +1341,8 @@ class PromptMiniApp:
         
     def update_line_numbers(self, text: str) -> None:
         """Update the line numbers displayed next to the prompt text."""
-        self.line_numbers.config(state='normal')
-        self.line_numbers.delete(1.0, tk.END)
-        if text:
-            line_count = text.count('\n') + 1
-            line_nums = '\n'.join(map(str, range(1, line_count + 1)))
-            self.line_numbers.insert(1.0, line_nums)
-        self.line_numbers.config(state='disabled')
+        # Consecutive prompts often have similar lengths, so only the difference is rendered
+        self.update_form_line_numbers(self.line_numbers, text)
 
     def _get_text_statistics(self, text: str) -> TextStats:
         """Calculate statistics for a given block of text."""
@@ -835,9 +1351,9 @@ class PromptMiniApp:
         
         char_count = len(text)
         word_count = len(text.split())
-        sentence_count = len(re.findall(r'[.!?]+', text))
+        sentence_count = len(_SENTENCE_RE.findall(text))
         line_count = text.count('\n') + 1
-        token_count = int(word_count * 1.3)  # Rough estimate
+        token_count = word_count * 13 // 10  # Rough estimate (1.3 tokens per word), in integer math
         
         return TextStats(char_count, word_count, sentence_count, line_count, token_count)
 
@@ -850,22 +1366,31 @@ class PromptMiniApp:
         )
         
     def update_tags_display(self, tags_str: Optional[str]) -> None:
-        """Update the tags display with clickable tag buttons."""
+        """Update the tags display with clickable tag buttons, reusing pooled buttons."""
+        # Editing mode and clear_item_display destroy the frame's children, so drop dead buttons
+        self.tag_buttons = [btn for btn in self.tag_buttons if btn.winfo_exists()]
         for widget in self.tags_display.winfo_children():
-            widget.destroy()
-            
-        if not tags_str:
-            return
+            if widget not in self.tag_buttons:
+                widget.destroy()
             
+        tags: Tuple[str, ...] = ()
         try:
-            tags = [t.strip() for t in (json.loads(tags_str) if tags_str.strip().startswith('[') else tags_str.split(','))]
-            for tag in filter(None, tags):
-                btn = ttk.Button(self.tags_display, text=tag, command=lambda t=tag: self.search_by_tag(t))
-                btn.pack(side=tk.LEFT, padx=2, pady=2)
+            tags = self.parse_tags(tags_str)
         except json.JSONDecodeError:
             self.logger.warning(f"Malformed tags JSON could not be parsed: {tags_str}")
             # Display as raw text if parsing fails
             ttk.Label(self.tags_display, text=tags_str, font=('TkDefaultFont', 8, 'italic')).pack(side=tk.LEFT)
+            
+        for i, tag in enumerate(tags):
+            if i < len(self.tag_buttons):
+                btn = self.tag_buttons[i]
+                btn.config(text=tag, command=lambda t=tag: self.search_by_tag(t))
+            else:
+                btn = ttk.Button(self.tags_display, text=tag, style='Tag.TButton', command=lambda t=tag: self.search_by_tag(t))
+                self.tag_buttons.append(btn)
+            btn.pack(side=tk.LEFT, padx=2, pady=2)
+        for btn in self.tag_buttons[len(tags):]:
+            btn.pack_forget()
                 
     def search_by_tag(self, tag: str) -> None:
         """Perform a search for a specific tag."""
@@ -876,12 +1401,12 @@ class PromptMiniApp:
         """Copy the current prompt text to the clipboard."""
         if self.current_item:
             try:
-                with self.get_db_connection() as conn:
-                    prompt = conn.execute('SELECT Prompt FROM prompts WHERE id = ?', (self.current_item,)).fetchone()
-                    if prompt and prompt['Prompt']:
-                        self.root.clipboard_clear()
-                        self.root.clipboard_append(prompt['Prompt'])
-                        self.update_status_bar("Prompt text copied to clipboard")
+                # The displayed row is normally cached already; only hit the database on a miss
+                prompt = self.get_prompt_row(self.current_item)
+                if prompt and prompt['Prompt']:
+                    self.root.clipboard_clear()
+                    self.root.clipboard_append(prompt['Prompt'])
+                    self.update_status_bar("Prompt text copied to clipboard")
             except Exception as e:
                 self.logger.error(f"Copy error: {e}")
                 self.update_status_bar(f"Copy failed: {e}")
@@ -889,23 +1414,30 @@ class PromptMiniApp:
     def make_urls_clickable(self) -> None:
         """Find and tag URLs in the URLs display to make them clickable."""
         content = self.urls_display.get(1.0, tk.END)
-        url_pattern = r'https?://[^\s\n]+'
-        
-        # Remove all existing URL tags
-        for tag in self.urls_display.tag_names():
-            if tag.startswith("url_"):
-                self.urls_display.tag_delete(tag)
-        
-        for i, line in enumerate(content.splitlines(), 1):
-            for match in re.finditer(url_pattern, line):
-                start, end = f"{i}.{match.start()}", f"{i}.{match.end()}"
-                tag_name = f"url_{i}_{match.start()}"
-                self.urls_display.tag_add(tag_name, start, end)
-                self.urls_display.tag_config(tag_name, foreground="blue", underline=True)
-                
-                self.urls_display.tag_bind(tag_name, "<Enter>", lambda e: self.urls_display.config(cursor="hand2"))
-                self.urls_display.tag_bind(tag_name, "<Leave>", lambda e: self.urls_display.config(cursor=""))
-                self.urls_display.tag_bind(tag_name, "<Button-1>", lambda e, url=match.group(): webbrowser.open(url))
+        self.urls_display.tag_remove("url", 1.0, tk.END)
+        
+        # One scan over the whole buffer; all ranges go to the shared "url" tag in a single call
+        ranges = []
+        for match in _URL_RE.finditer(content):
+            ranges.extend((f"1.0 + {match.start()} chars", f"1.0 + {match.end()} chars"))
+        if ranges:
+            self.urls_display.tag_add("url", *ranges)
+            
+    def on_url_enter(self, event: tk.Event) -> None:
+        """Show a hand cursor while hovering a URL."""
+        event.widget.config(cursor="hand2")
+
+    def on_url_leave(self, event: tk.Event) -> None:
+        """Restore the default cursor when leaving a URL."""
+        event.widget.config(cursor="")
+
+    def on_url_click(self, event: tk.Event) -> None:
+        """Open the URL under the mouse pointer in the Session URLs display."""
+        widget = event.widget
+        index = widget.index(f"@{event.x},{event.y}")
+        url_range = widget.tag_prevrange("url", f"{index} + 1 chars")
+        if url_range:
+            webbrowser.open(widget.get(*url_range))
         
     def show_search_help(self) -> None:
         """Show a dialog with FTS5 search syntax help."""
@@ -946,10 +1478,12 @@ class PromptMiniApp:
             try:
                 with self.get_db_connection() as conn:
                     item_ids = tuple(self.selected_items)
-                    conn.execute(f"DELETE FROM prompts WHERE id IN ({','.join('?' for _ in item_ids)})", item_ids)
-                    for item_id in item_ids:
-                        self.clear_prompt_cache(item_id)
+                    # Chunk to stay under SQLite's bound-parameter limit; one commit covers all chunks
+                    for start in range(0, len(item_ids), 500):
+                        chunk = item_ids[start:start + 500]
+                        conn.execute(f"DELETE FROM prompts WHERE id IN ({','.join('?' * len(chunk))})", chunk)
                     conn.commit()
+                self.prompts_changed()
                 
                 self.current_item = None
                 self.selected_items = []
@@ -967,32 +1501,45 @@ class PromptMiniApp:
 
     def update_action_buttons(self) -> None:
         """Centralized state machine for managing action buttons."""
-        # Hide all buttons first
-        for btn in [self.new_btn, self.duplicate_btn, self.change_btn, self.in_window_btn, self.delete_btn, self.save_btn, self.cancel_btn]:
-            btn.pack_forget()
-
-        if self.editing_mode:
-            # Edit mode: Show Save and Cancel
-            self.save_btn.pack(side=tk.LEFT, padx=(0, 5))
-            self.cancel_btn.pack(side=tk.LEFT, padx=5)
-        else:
-            # View mode: Show standard actions
-            self.new_btn.pack(side=tk.LEFT, padx=(0, 5))
-            
+        # Selection changes only update button states; the buttons are re-packed only when the mode flips
+        if self._packed_edit_layout != self.editing_mode:
+            for btn in [self.new_btn, self.duplicate_btn, self.change_btn, self.in_window_btn, self.delete_btn, self.save_btn, self.cancel_btn]:
+                btn.pack_forget()
+            if self.editing_mode:
+                # Edit mode: Show Save and Cancel
+                self.save_btn.pack(side=tk.LEFT, padx=(0, 5))
+                self.cancel_btn.pack(side=tk.LEFT, padx=5)
+            else:
+                # View mode: Show standard actions
+                self.new_btn.pack(side=tk.LEFT, padx=(0, 5))
+                self.duplicate_btn.pack(side=tk.LEFT, padx=5)
+                self.change_btn.pack(side=tk.LEFT, padx=5)
+                self.in_window_btn.pack(side=tk.LEFT, padx=5)
+                self.delete_btn.pack(side=tk.LEFT, padx=(20, 0))
+            self._packed_edit_layout = self.editing_mode
+
+        if not self.editing_mode:
             num_selected = len(self.selected_items)
             
             # Duplicate, Change, and in Window are only for single selections
-            self.duplicate_btn.config(state='normal' if num_selected == 1 else 'disabled')
-            self.change_btn.config(state='normal' if num_selected == 1 else 'disabled')
-            self.in_window_btn.config(state='normal' if num_selected == 1 else 'disabled')
-            self.duplicate_btn.pack(side=tk.LEFT, padx=5)
-            self.change_btn.pack(side=tk.LEFT, padx=5)
-            self.in_window_btn.pack(side=tk.LEFT, padx=5)
+            single_state = 'normal' if num_selected == 1 else 'disabled'
+            for btn in [self.duplicate_btn, self.change_btn, self.in_window_btn]:
+                self._configure_button(btn, state=single_state)
             
             # Delete button state
-            self.delete_btn.config(state='normal' if num_selected > 0 else 'disabled')
-            self.delete_btn.config(text=f"Delete ({num_selected})" if num_selected > 1 else "Delete")
-            self.delete_btn.pack(side=tk.LEFT, padx=(20, 0))
+            self._configure_button(
+                self.delete_btn,
+                state='normal' if num_selected > 0 else 'disabled',
+                text=f"Delete ({num_selected})" if num_selected > 1 else "Delete"
+            )
+
+    def _configure_button(self, button: ttk.Button, **options: str) -> None:
+        """Apply button options, skipping the Tk round-trip for values that are already set."""
+        applied = self._button_options.setdefault(str(button), {})
+        changed = {key: value for key, value in options.items() if applied.get(key) != value}
+        if changed:
+            button.config(**changed)
+            applied.update(changed)
 
     def save_edits(self) -> None:
         """Save in-place edits to the database."""
@@ -1006,15 +1553,19 @@ class PromptMiniApp:
             note = self.note_display.get(1.0, tk.END).strip()
             item_id = self.current_item
 
-            tags_json = json.dumps([t.strip() for t in tags_input.split(',') if t.strip()]) if tags_input else None
+            tags_json = _encode_tags([t.strip() for t in tags_input.split(',') if t.strip()]) if tags_input else None
 
-            with self.get_db_connection() as conn:
-                conn.execute('''
-                    UPDATE prompts SET Modified = ?, Purpose = ?, Prompt = ?, SessionURLs = ?, Tags = ?, Note = ?
-                    WHERE id = ?
-                ''', (datetime.now().isoformat(), purpose, prompt, session_urls, tags_json, note, item_id))
-                self.clear_prompt_cache(item_id)
-                conn.commit()
+            if self.is_prompt_unchanged(item_id, purpose, prompt, session_urls, tags_json, note):
+                # Nothing to write: leave Modified (and so the result order) alone and skip the re-search
+                self.exit_editing_mode()
+                self.update_item_display(force_refresh=True)
+                self.update_status_bar("No changes to save")
+                return
+
+            with self.get_db_connection() as conn, conn:
+                conn.execute(self.UPDATE_PROMPT_SQL,
+                             (datetime.now().isoformat(), purpose, prompt, session_urls, tags_json, note, item_id))
+            self.prompts_changed()
 
             self.exit_editing_mode()
             self.perform_search(select_item_id=item_id)
@@ -1023,6 +1574,21 @@ class PromptMiniApp:
             self.logger.error(f"Error saving edits: {e}")
             messagebox.showerror("Save Error", f"Failed to save changes: {e}")
 
+    def is_prompt_unchanged(self, item_id: int, purpose: str, prompt: str, session_urls: str,
+                            tags_json: Optional[str], note: str) -> bool:
+        """Return True if saving these values would leave the stored prompt as it is."""
+        row = self.get_prompt_row(item_id)
+        if row is None:
+            return False
+        if ((row['Purpose'] or "") != purpose or (row['Prompt'] or "") != prompt
+                or (row['SessionURLs'] or "") != session_urls or (row['Note'] or "") != note):
+            return False
+        # Compare tags by content: older rows were stored with json.dumps' default spacing
+        try:
+            return self.parse_tags(row['Tags']) == self.parse_tags(tags_json)
+        except json.JSONDecodeError:
+            return False
+
     def cancel_edits(self) -> None:
         """Cancel in-place editing and restore original content."""
         if self.editing_mode:
@@ -1039,9 +1605,9 @@ class PromptMiniApp:
         if not self.current_item or self.editing_mode: return
             
         try:
-            with self.get_db_connection() as conn:
-                row = conn.execute('SELECT * FROM prompts WHERE id = ?', (self.current_item,)).fetchone()
-                if not row: return
+            # Edits are compared against the stored row, so bypass (and refresh) the cache
+            row = self.get_prompt_row(self.current_item, force_refresh=True)
+            if not row: return
 
             # Store original data for comparison
             self.original_data = {
@@ -1061,7 +1627,8 @@ class PromptMiniApp:
             self.update_status_bar("EDITING MODE - Selection locked")
 
             for widget in [self.prompt_display, self.urls_display, self.note_display]:
-                widget.config(state='normal')
+                widget.edit_reset()
+                widget.config(state='normal', undo=True)
 
             self.purpose_display.pack_forget()
             self.purpose_entry = ttk.Entry(self.purpose_frame, font=('TkDefaultFont', 9, 'bold'))
@@ -1071,11 +1638,12 @@ class PromptMiniApp:
 
             for widget in self.tags_display.winfo_children():
                 widget.destroy()
+            # The tag buttons are gone, so the next display update must rebuild them
+            self._rendered_fields.pop('Tags', None)
             self.tags_entry = ttk.Entry(self.tags_display)
             if row['Tags']:
                 try:
-                    tags = json.loads(row['Tags']) if row['Tags'].strip().startswith('[') else row['Tags'].split(',')
-                    self.tags_entry.insert(0, ', '.join(t.strip() for t in tags))
+                    self.tags_entry.insert(0, ', '.join(self.parse_tags(row['Tags'])))
                 except json.JSONDecodeError:
                     self.tags_entry.insert(0, row['Tags']) # fallback
             self.tags_entry.pack(fill=tk.X)
@@ -1129,14 +1697,9 @@ class PromptMiniApp:
                 
                 all_tags = set()
                 for row in cursor.fetchall():
-                    tags_str = row['Tags']
                     try:
-                        if tags_str.strip().startswith('['):
-                            tags = json.loads(tags_str)
-                        else:
-                            tags = [t.strip() for t in tags_str.split(',')]
-                        all_tags.update(t for t in tags if t.strip())
-                    except (json.JSONDecodeError, AttributeError):
+                        all_tags.update(self.parse_tags(row['Tags']))
+                    except json.JSONDecodeError:
                         continue
                 
                 # Create suggestion frame
@@ -1189,7 +1752,8 @@ class PromptMiniApp:
         self.update_status_bar()
         
         for widget in [self.prompt_display, self.urls_display, self.note_display]:
-            widget.config(state='disabled')
+            widget.config(state='disabled', undo=False)
+            widget.edit_reset()
             # Unbind change events
             widget.unbind('<KeyRelease>')
             widget.unbind('<Button-1>')
@@ -1221,7 +1785,7 @@ class PromptMiniApp:
                 data = conn.execute('SELECT * FROM prompts WHERE id = ?', (item_id,)).fetchone()
             
         self.create_prompt_form(window, mode, item_id, data)
-        self.root.after(10, lambda: self.auto_size_window(window, 1000, 900, True))
+        self.auto_size_window(window, 1000, 900, True)
         
     def create_prompt_form(self, window: tk.Toplevel, mode: str, item_id: Optional[int], data: Optional[sqlite3.Row]) -> None:
         """Create the UI components for the prompt editing form."""
@@ -1263,12 +1827,7 @@ class PromptMiniApp:
         ttk.Button(status_frame, text="Copy", command=lambda: self.copy_text_to_clipboard(prompt_text.get(1.0, tk.END))).pack(side=tk.RIGHT, padx=(5, 0))
         ttk.Button(status_frame, text="Tune with AI", command=lambda: self.tune_text_with_ai(prompt_text)).pack(side=tk.RIGHT)
         
-        def update_form_status(*args: Any) -> None:
-            text = prompt_text.get(1.0, tk.END)
-            self.update_form_line_numbers(line_numbers, text)
-            self.update_form_status_label(status_label, text)
-        prompt_text.bind('<KeyRelease>', update_form_status)
-        update_form_status()
+        FormStatusBinder(self, prompt_text, line_numbers, status_label)
         
         urls_frame = ttk.LabelFrame(window, text="Session URLs")
         urls_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -1280,9 +1839,7 @@ class PromptMiniApp:
         tags_frame.pack(fill=tk.X, padx=10, pady=5)
         tags_str = ""
         if data and data['Tags']:
-            try:
-                tags = json.loads(data['Tags']) if data['Tags'].strip().startswith('[') else data['Tags'].split(',')
-                tags_str = ', '.join(t.strip() for t in tags)
+            try: tags_str = ', '.join(self.parse_tags(data['Tags']))
             except json.JSONDecodeError: tags_str = data['Tags']
         tags_var = tk.StringVar(value=tags_str)
         tags_entry = ttk.Entry(tags_frame, textvariable=tags_var)
@@ -1291,7 +1848,7 @@ class PromptMiniApp:
         if WORDCLOUD_AVAILABLE:
             suggestions_frame = ttk.Frame(tags_frame)
             suggestions_frame.pack(fill=tk.X, padx=5, pady=2)
-            self.generate_tag_suggestions(suggestions_frame, tags_var, prompt_text)
+            self.generate_tag_suggestions(suggestions_frame, tags_var, prompt_text, tags_entry)
             
         note_frame = ttk.LabelFrame(window, text="Note")
         note_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -1305,14 +1862,25 @@ class PromptMiniApp:
         )).pack(pady=10)
         
     def update_form_line_numbers(self, line_numbers: tk.Text, text: str) -> None:
-        """Update line numbers in a form window."""
+        """Update a line-number gutter, appending or trimming only the lines that changed."""
+        key = str(line_numbers)
+        if key not in self.form_line_counts:
+            line_numbers.bind('<Destroy>', lambda e: self.form_line_counts.pop(key, None), add='+')
+        previous = self.form_line_counts.get(key, 0)
+        line_count = text.count('\n') + 1 if text else 0
+        if line_count == previous:
+            return
+
         line_numbers.config(state='normal')
-        line_numbers.delete(1.0, tk.END)
-        if text:
-            line_count = text.count('\n') + 1
-            line_nums = '\n'.join(map(str, range(1, line_count + 1)))
-            line_numbers.insert(1.0, line_nums)
+        if line_count > previous:
+            new_nums = '\n'.join(map(str, range(previous + 1, line_count + 1)))
+            line_numbers.insert(tk.END, f"\n{new_nums}" if previous else new_nums)
+        elif line_count:
+            line_numbers.delete(f"{line_count}.end", tk.END)
+        else:
+            line_numbers.delete(1.0, tk.END)
         line_numbers.config(state='disabled')
+        self.form_line_counts[key] = line_count
         
     def update_form_status_label(self, status_label: ttk.Label, text: str) -> None:
         """Update status label in a form window with text statistics."""
@@ -1334,34 +1902,56 @@ class PromptMiniApp:
         if text:
             self.open_ai_tuning_window_with_text(text, text_widget)
             
-    def generate_tag_suggestions(self, parent: ttk.Frame, tags_var: tk.StringVar, prompt_text: tk.Text) -> None:
-        """Generate keyword-based tag suggestions from the prompt text."""
+    def generate_tag_suggestions(self, parent: ttk.Frame, tags_var: tk.StringVar, prompt_text: tk.Text,
+                                 tags_entry: ttk.Entry) -> None:
+        """Generate keyword-based tag suggestions from the prompt text, first built when the form is used."""
         if not WORDCLOUD_AVAILABLE: return
+        # Per form: pending timer, the text and suggestion words last rendered, and pooled buttons
+        state: Dict[str, Any] = {'built': False, 'timer': None, 'text': None, 'words': None, 'buttons': []}
             
         def update_suggestions() -> None:
+            state['timer'] = None
+            state['built'] = True
             try:
+                if not prompt_text.winfo_exists(): return
                 text = prompt_text.get(1.0, tk.END).strip()
-                if not text: return
-                
-                words = re.findall(r'\b\w{3,}\b', text.lower())
-                common_words = {'the', 'and', 'for', 'with', 'this', 'that', 'are', 'was'}
-                word_freq = Counter(w for w in words if w not in common_words)
+                if not text or text == state['text']: return
+                state['text'] = text
                 
-                for widget in parent.winfo_children(): widget.destroy()
+                words: List[str] = []
+                if len(text) >= 50:  # Shorter text is too short for meaningful keyword suggestions
+                    word_freq = Counter(w for w in _TAG_WORD_RE.findall(text.lower()) if w not in _TAG_STOPWORDS)
+                    words = [word for word, _ in word_freq.most_common(7)]
+                if words == state['words']: return
+                state['words'] = words
                 
-                for word, _ in word_freq.most_common(7):
-                    btn = ttk.Button(parent, text=word, command=lambda w=word: self.add_tag_suggestion(tags_var, w))
+                buttons: List[ttk.Button] = state['buttons']
+                while len(buttons) < len(words):
+                    btn = ttk.Button(parent)
+                    # Bound once per pooled button: it adds whatever word the button currently shows
+                    btn.config(command=lambda b=btn: self.add_tag_suggestion(tags_var, b.cget('text')))
+                    buttons.append(btn)
+                for btn, word in zip(buttons, words):
+                    btn.config(text=word)
                     btn.pack(side=tk.LEFT, padx=2, pady=2)
+                for btn in buttons[len(words):]:
+                    btn.pack_forget()
             except Exception as e:
                 self.logger.error(f"Tag suggestion error: {e}")
                 
-        # Debounce the update
+        # Debounce the update; only the last keystroke of a burst recomputes
         def on_key_release(event: tk.Event) -> None:
-            if self.text_debounce_timer: self.root.after_cancel(self.text_debounce_timer)
-            self.text_debounce_timer = self.root.after(1000, update_suggestions)
+            if state['timer']: self.root.after_cancel(state['timer'])
+            state['timer'] = self.root.after(300, update_suggestions)
         
-        prompt_text.bind('<KeyRelease>', on_key_release)
-        update_suggestions()
+        def on_tags_focus(event: tk.Event) -> None:
+            if not state['built']:
+                update_suggestions()
+
+        # Add to, rather than replace, the form's status-update binding
+        prompt_text.bind('<KeyRelease>', on_key_release, add='+')
+        # Opening the form no longer pays for suggestions the user may never look at
+        tags_entry.bind('<FocusIn>', on_tags_focus, add='+')
         
     def add_tag_suggestion(self, tags_var: tk.StringVar, word: str) -> None:
         """Add a suggested word to the tags entry."""
@@ -1375,22 +1965,21 @@ class PromptMiniApp:
         try:
             now = datetime.now().isoformat()
             tag_list = [t.strip() for t in tags.split(',') if t.strip()]
-            tags_json = json.dumps(tag_list) if tag_list else None
+            tags_json = _encode_tags(tag_list) if tag_list else None
+
+            if mode == 'change' and item_id and self.is_prompt_unchanged(item_id, purpose, prompt, session_urls, tags_json, note):
+                window.destroy()
+                self.update_status_bar("No changes to save")
+                return
             
-            with self.get_db_connection() as conn:
+            # The inner `conn` context wraps the write in one transaction and commits on success
+            with self.get_db_connection() as conn, conn:
                 if mode in ('new', 'duplicate'):
-                    cursor = conn.execute('''
-                        INSERT INTO prompts (Created, Modified, Purpose, Prompt, SessionURLs, Tags, Note)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (now, now, purpose, prompt, session_urls, tags_json, note))
+                    cursor = conn.execute(self.INSERT_PROMPT_SQL, (now, now, purpose, prompt, session_urls, tags_json, note))
                     item_id = cursor.lastrowid
                 elif mode == 'change' and item_id:
-                    conn.execute('''
-                        UPDATE prompts SET Modified = ?, Purpose = ?, Prompt = ?, SessionURLs = ?, Tags = ?, Note = ?
-                        WHERE id = ?
-                    ''', (now, purpose, prompt, session_urls, tags_json, note, item_id))
-                    self.clear_prompt_cache(item_id)
-                conn.commit()
+                    conn.execute(self.UPDATE_PROMPT_SQL, (now, purpose, prompt, session_urls, tags_json, note, item_id))
+            self.prompts_changed()
 
             window.destroy()
             if item_id:
@@ -1411,18 +2000,34 @@ class PromptMiniApp:
                 self.logger.info(f"Cleared cache for item {item_id}")
         else:
             self.prompt_cache.clear()
+            self.tree_values_cache.clear()
+            self.search_cache.clear()
             self.logger.info("Cleared entire prompt cache")
             
     def open_ai_tuning_window(self, item_id: int) -> None:
         """Open the AI tuning window for an existing prompt."""
-        try:
-            with self.get_db_connection() as conn:
-                prompt = conn.execute('SELECT Prompt FROM prompts WHERE id = ?', (item_id,)).fetchone()
-                if prompt and prompt['Prompt']:
-                    self.open_ai_tuning_window_with_text(prompt['Prompt'])
-        except Exception as e:
-            self.logger.error(f"AI tuning error: {e}")
-            messagebox.showerror("AI Tuning Error", f"Failed to open AI tuning: {e}")
+        cached = self.cached_prompt_row(item_id)
+        if cached is not None:
+            if cached['Prompt']:
+                self.open_ai_tuning_window_with_text(cached['Prompt'])
+            return
+
+        # Cache miss: read the prompt on the worker thread so a busy writer cannot stall the UI
+        def fetch_prompt() -> Optional[str]:
+            with self.get_read_connection() as conn:
+                row = conn.execute('SELECT Prompt FROM prompts WHERE id = ?', (item_id,)).fetchone()
+            return row['Prompt'] if row else None
+
+        def on_fetched(future: Future) -> None:
+            error = future.exception()
+            if error:
+                self.logger.error(f"AI tuning error: {error}")
+                messagebox.showerror("AI Tuning Error", f"Failed to open AI tuning: {error}")
+            elif future.result():
+                self.open_ai_tuning_window_with_text(future.result())
+
+        future = self.search_executor.submit(fetch_prompt)
+        future.add_done_callback(lambda f: self.root.after(0, lambda: on_fetched(f)))
             
     def open_ai_tuning_window_with_text(self, text: str, target_widget: Optional[tk.Text] = None) -> None:
         """Open the AI tuning window with pre-filled text."""
@@ -1440,7 +2045,7 @@ class PromptMiniApp:
         ttk.Label(provider_frame, text="AI Provider:").pack(side=tk.LEFT)
         provider_var = tk.StringVar(value=self.settings_manager.get('ai_provider', 'OpenAI'))
         provider_combo = ttk.Combobox(provider_frame, textvariable=provider_var, 
-                                     values=list(AIManager._get_default_settings().keys()),
+                                     values=list(self.ai_defaults.keys()),
                                      state="readonly", width=15)
         provider_combo.pack(side=tk.LEFT, padx=(5, 10))
         
@@ -1458,11 +2063,11 @@ class PromptMiniApp:
         model_combo.pack(side=tk.LEFT, padx=(5, 5))
         
         ttk.Button(provider_frame, text="✏", width=3,
-                   command=lambda: self.edit_models(provider_var.get(), model_var)).pack(side=tk.LEFT, padx=(5, 10))
+                   command=lambda: self.edit_models(provider_var.get(), on_provider_change)).pack(side=tk.LEFT, padx=(5, 10))
         
         def on_provider_change(*args: Any) -> None:
             provider = provider_var.get()
-            provider_defaults = AIManager._get_default_settings().get(provider, {})
+            provider_defaults = self.ai_defaults.get(provider, {})
             custom_models = self.settings_manager.get('custom_models', {}).get(provider)
 
             if custom_models:
@@ -1513,33 +2118,33 @@ class PromptMiniApp:
 
         panels['Input']['text'].insert(1.0, f"Please help me improve this AI prompt:\n\n{text}")
         
+        # Shared by the generate and apply buttons: only a cleanly finished response may be applied
+        ai_stream: Dict[str, Any] = {'status': 'idle', 'generation': 0}
         ttk.Button(provider_frame, text="Generate AI Response", command=lambda: self.generate_ai_response_with_settings(
-            panels['Input']['text'], panels['Output']['text'], panels['Output']['lines'], panels['Output']['status'],
-            provider_var.get(), api_key_var.get(), model_var.get()
+            panels['Input']['text'], panels['Output']['text'],
+            provider_var.get(), api_key_var.get(), model_var.get(), ai_stream
         )).pack(side=tk.LEFT, padx=(5, 0))
         
         control_frame = ttk.Frame(window)
         control_frame.pack(fill=tk.X, padx=10, pady=5)
         if target_widget:
             ttk.Button(control_frame, text="Apply to Original", command=lambda: self.apply_ai_result(
-                panels['Output']['text'], target_widget, window
+                panels['Output']['text'], target_widget, window, ai_stream
             )).pack(side=tk.LEFT, padx=5)
         ttk.Button(control_frame, text="Close", command=window.destroy).pack(side=tk.RIGHT, padx=5)
         
-        def update_statuses(*args: Any) -> None:
-            for side in ['Input', 'Output']:
-                t = panels[side]['text'].get(1.0, tk.END)
-                self.update_form_line_numbers(panels[side]['lines'], t)
-                self.update_form_status_label(panels[side]['status'], t)
-                
-        panels['Input']['text'].bind('<KeyRelease>', update_statuses)
-        update_statuses()
+        # Streamed output is picked up through <<Modified>> like typing is, at most once per binder delay
+        for panel in panels.values():
+            FormStatusBinder(self, panel['text'], panel['lines'], panel['status'])
         
-        self.root.after(10, lambda: self.auto_size_window(window, 1400, 900, True))
+        self.auto_size_window(window, 1400, 900, True)
         
-    def generate_ai_response_with_settings(self, input_text: tk.Text, output_text: tk.Text, output_lines: tk.Text, 
-                                           output_status: ttk.Label, provider: str, api_key: str, model: str) -> None:
-        """Generate an AI response using the specified settings in a background thread."""
+    def generate_ai_response_with_settings(self, input_text: tk.Text, output_text: tk.Text,
+                                           provider: str, api_key: str, model: str, ai_stream: Dict[str, Any]) -> None:
+        """Generate an AI response using the specified settings in a background thread.
+
+        ai_stream['status'] moves from 'running' to 'done' or 'failed'; a newer generation supersedes older ones.
+        """
         input_prompt = input_text.get(1.0, tk.END).strip()
         if not input_prompt: return messagebox.showwarning("No Input", "Please enter text to process")
         if not api_key: return messagebox.showerror("AI Error", "Please enter an API key")
@@ -1548,31 +2153,118 @@ class PromptMiniApp:
         self.settings_manager.set('ai_api_key', api_key)
             
         output_text.config(state='normal')
-        output_text.delete(1.0, tk.END)
-        output_text.insert(1.0, "Generating AI response...")
+        output_text.replace(1.0, tk.END, "Generating AI response...")
         output_text.config(state='disabled')
         
+        ai_stream['generation'] += 1
+        ai_stream['status'] = 'running'
+        generation = ai_stream['generation']
+
+        # Chunks are appended as they arrive; the Output panel's FormStatusBinder refreshes line numbers/stats
+        stream_state: Dict[str, Any] = {'started': False}
+
+        def is_current() -> bool:
+            return generation == ai_stream['generation'] and output_text.winfo_exists()
+
+        def append_chunk(chunk: str) -> None:
+            if not is_current(): return
+            output_text.config(state='normal')
+            if stream_state['started']:
+                output_text.insert(tk.END, chunk)
+            else:
+                output_text.replace(1.0, tk.END, chunk)
+                stream_state['started'] = True
+            output_text.config(state='disabled')
+
+        def finish_stream() -> None:
+            if not is_current(): return
+            if not stream_state['started']:
+                append_chunk("")
+            ai_stream['status'] = 'done'
+
+        def show_error(message: str) -> None:
+            if not is_current(): return
+            ai_stream['status'] = 'failed'
+            output_text.config(state='normal')
+            output_text.replace(1.0, tk.END, message)
+            output_text.config(state='disabled')
+
+        use_cache = self.ai_cache_var.get()
+
         def ai_worker() -> None:
             try:
-                ai_manager = AIManager(tool_name=provider, api_key=api_key)
                 override_settings = {'MODEL': model} if model else {}
-                response = ai_manager.generate_response(input_prompt, override_settings)
-                
-                def update_ui() -> None:
-                    output_text.config(state='normal')
-                    output_text.delete(1.0, tk.END)
-                    output_text.insert(1.0, response)
-                    output_text.config(state='disabled')
-                    self.update_form_line_numbers(output_lines, response)
-                    self.update_form_status_label(output_status, response)
-                    
-                self.root.after(0, update_ui)
+                cache_key = self.ai_cache_key(provider, override_settings, input_prompt)
+                cached = self.get_cached_ai_response(cache_key) if use_cache else None
+                if cached is not None:
+                    self.logger.info(f"Using cached {provider} response")
+                    self.root.after(0, lambda: append_chunk(cached))
+                    self.root.after(0, finish_stream)
+                    return
+
+                ai_manager = self.get_ai_manager(provider, api_key)
+                chunks: List[str] = []
+                for chunk in ai_manager.generate_response_stream(input_prompt, override_settings):
+                    chunks.append(chunk)
+                    self.root.after(0, lambda c=chunk: append_chunk(c))
+                self.root.after(0, finish_stream)
+
+                # Only a stream that ended without raising is complete enough to replay from the cache
+                response = ''.join(chunks)
+                if use_cache and response:
+                    self.store_ai_response(cache_key, response)
+            except AIResponseError as e:
+                # Already logged by AIManager; the message replaces any partial output
+                self.root.after(0, lambda msg=str(e): show_error(msg))
             except Exception as e:
                 self.logger.error(f"AI generation error: {e}")
-                self.root.after(0, lambda: output_text.config(state='normal') or output_text.delete(1.0, tk.END) or output_text.insert(1.0, f"AI Error: {e}") or output_text.config(state='disabled'))
+                self.root.after(0, lambda msg=f"AI Error: {e}": show_error(msg))
                 
-        threading.Thread(target=ai_worker, daemon=True).start()
+        self.ai_executor.submit(ai_worker)
         
+    @staticmethod
+    def ai_cache_key(provider: str, override_settings: Dict[str, Any], prompt: str) -> str:
+        """Hash everything that determines an AI response into a compact cache key."""
+        payload = json.dumps([provider, override_settings, prompt], sort_keys=True)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get_cached_ai_response(self, key: str) -> Optional[str]:
+        """Return a previously stored AI response for the key, if any."""
+        try:
+            with self.get_read_connection() as conn:
+                row = conn.execute('SELECT response FROM ai_cache WHERE key = ?', (key,)).fetchone()
+            return row['response'] if row else None
+        except sqlite3.Error:
+            return None
+
+    def store_ai_response(self, key: str, response: str) -> None:
+        """Persist an AI response so identical requests are answered without calling the provider."""
+        try:
+            with self.get_db_connection() as conn, conn:
+                conn.execute('INSERT OR REPLACE INTO ai_cache (key, response) VALUES (?, ?)', (key, response))
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not cache AI response: {e}")
+
+    def clear_ai_cache(self) -> None:
+        """Delete all cached AI responses."""
+        try:
+            with self.get_db_connection() as conn, conn:
+                count = conn.execute('DELETE FROM ai_cache').rowcount
+            self.logger.info(f"Cleared {count} cached AI responses.")
+            messagebox.showinfo("AI Cache", f"Cleared {count} cached AI responses.")
+        except sqlite3.Error as e:
+            self.logger.error(f"Clear AI cache error: {e}")
+            messagebox.showerror("AI Cache", f"Failed to clear AI cache: {e}")
+
+    def get_ai_manager(self, provider: str, api_key: str) -> AIManager:
+        """Return a cached AIManager for (provider, api_key) so its HTTP session is reused across requests."""
+        key = (provider, api_key)
+        with self.ai_managers_lock:
+            manager = self.ai_managers.get(key)
+            if manager is None:
+                manager = self.ai_managers[key] = AIManager(tool_name=provider, api_key=api_key)
+            return manager
+
     def open_api_key_url(self, provider: str) -> None:
         """Open the appropriate URL for obtaining an API key for the given provider."""
         urls = {
@@ -1586,9 +2278,9 @@ class PromptMiniApp:
         else:
             messagebox.showinfo("API Key", f"Please visit the {provider} website for your API key.")
             
-    def edit_models(self, provider: str, model_var: tk.StringVar) -> None:
+    def edit_models(self, provider: str, on_save: Callable[[], None]) -> None:
         """Open a dialog to edit the list of available models for a provider."""
-        provider_defaults = AIManager._get_default_settings().get(provider, {})
+        provider_defaults = self.ai_defaults.get(provider, {})
         custom_models = self.settings_manager.get('custom_models', {}).get(provider)
         
         if custom_models:
@@ -1597,43 +2289,59 @@ class PromptMiniApp:
             models_list = provider_defaults.get('MODELS_LIST', [provider_defaults.get('MODEL', '')])
             models_list = [m for m in models_list if m]
 
-        dialog = tk.Toplevel(self.root)
+        state = self.models_dialog_state
+        state.update(provider=provider, on_save=on_save)
+        dialog = self.models_dialog
+        if dialog is not None and dialog.winfo_exists():
+            dialog.title(f"Edit Models - {provider}")
+            state['text'].replace(1.0, tk.END, '\n'.join(models_list))
+            dialog.deiconify()
+            dialog.lift()
+            dialog.grab_set()
+            return
+
+        dialog = self.models_dialog = tk.Toplevel(self.root)
         dialog.title(f"Edit Models - {provider}")
         dialog.transient(self.root)
         dialog.grab_set()
         dialog.withdraw()
         
         ttk.Label(dialog, text="Available Models (one per line, first is default):").pack(pady=5)
-        models_text = scrolledtext.ScrolledText(dialog, height=15)
+        models_text = state['text'] = scrolledtext.ScrolledText(dialog, height=15)
         models_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         models_text.insert(1.0, '\n'.join(models_list))
+
+        def close_dialog() -> None:
+            dialog.grab_release()
+            dialog.withdraw()
         
         def save_models() -> None:
             new_models = [m.strip() for m in models_text.get(1.0, tk.END).strip().split('\n') if m.strip()]
             if new_models:
                 all_custom_models = self.settings_manager.get('custom_models', {})
-                all_custom_models[provider] = new_models
+                all_custom_models[state['provider']] = new_models
                 self.settings_manager.set('custom_models', all_custom_models) # This also saves
                 
-                # Manually trigger the update in the AI window
-                provider_combo = window.nametowidget(provider_var.get())
-                on_provider_change()
+                # Refresh the model list in the AI window
+                state['on_save']()
 
-                dialog.destroy()
+                close_dialog()
 
         btn_frame = ttk.Frame(dialog)
         btn_frame.pack(fill=tk.X, padx=10, pady=5)
         ttk.Button(btn_frame, text="Save", command=save_models).pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=close_dialog).pack(side=tk.LEFT, padx=5)
+        dialog.protocol("WM_DELETE_WINDOW", close_dialog)
         
-        self.root.after(10, lambda: self.auto_size_window(dialog, 500, 400, True))
+        self.auto_size_window(dialog, 500, 400, True)
         
-    def apply_ai_result(self, output_text: tk.Text, target_widget: tk.Text, window: tk.Toplevel) -> None:
-        """Apply the AI-generated text back to the original text widget."""
+    def apply_ai_result(self, output_text: tk.Text, target_widget: tk.Text, window: tk.Toplevel,
+                        ai_stream: Dict[str, Any]) -> None:
+        """Apply the AI-generated text back to the original text widget once its stream has finished."""
+        if ai_stream['status'] != 'done': return
         result = output_text.get(1.0, tk.END).strip()
-        if result and "Generating AI response..." not in result and "AI Error:" not in result:
-            target_widget.delete(1.0, tk.END)
-            target_widget.insert(1.0, result)
+        if result:
+            target_widget.replace(1.0, tk.END, result)
             window.destroy()
             messagebox.showinfo("Applied", "AI result applied successfully.")
             
@@ -1645,132 +2353,217 @@ class PromptMiniApp:
             messagebox.showinfo("Export Location", f"Export location set to: {folder}")
             
     def export_view(self, format_type: str) -> None:
-        """Export the currently visible search results to a file."""
-        if not hasattr(self, 'search_results') or not self.search_results:
+        """Export every match of the current search, not just the pages loaded so far, to a file."""
+        if not self.search_results:
             return messagebox.showwarning("No Data", "No items to export.")
-        self._export_data(self.search_results, format_type, "view")
+        self._export_data(self._iter_search_matches(self.search_results_term, self.search_results_order), format_type, "view")
             
     def export_all(self, format_type: str) -> None:
         """Export all prompts from the database to a file."""
         try:
-            with self.get_db_connection() as conn:
-                all_results = conn.execute('SELECT * FROM prompts ORDER BY Modified DESC').fetchall()
-            if not all_results:
-                return messagebox.showwarning("No Data", "Database is empty.")
-            self._export_data(all_results, format_type, "all")
+            with self.get_read_connection() as conn:
+                has_rows = conn.execute('SELECT EXISTS (SELECT 1 FROM prompts)').fetchone()[0]
         except Exception as e:
             self.logger.error(f"Export All error: {e}")
-            messagebox.showerror("Export Error", f"Failed to fetch data for export: {e}")
-
-    def _export_data(self, data: List[sqlite3.Row], format_type: str, scope: str) -> None:
-        """Generic data export handler."""
+            return messagebox.showerror("Export Error", f"Failed to fetch data for export: {e}")
+        if not has_rows:
+            return messagebox.showwarning("No Data", "Database is empty.")
+        self._export_data(self._iter_all_prompts(), format_type, "all")
+
+    def _iter_all_prompts(self) -> Generator[sqlite3.Row, None, None]:
+        """Stream every prompt, newest first, through a pooled read-only connection."""
+        with self.get_read_connection() as conn:
+            cursor = conn.execute('SELECT id, Created, Modified, Purpose, Prompt, SessionURLs, Tags, Note '
+                                  'FROM prompts ORDER BY Modified DESC')
+            cursor.arraysize = self.EXPORT_CHUNK_SIZE
+            yield from self._iter_cursor(cursor)
+
+    def _iter_search_matches(self, term: str, order: str) -> Generator[sqlite3.Row, None, None]:
+        """Stream full prompt rows for every match of a search, in the listing's order and without paging."""
+        columns = 'p.id, p.Created, p.Modified, p.Purpose, p.Prompt, p.SessionURLs, p.Tags, p.Note'
+        with self.get_read_connection() as conn:
+            if term:
+                fts_query = self.build_fts_query(term)
+                if not fts_query:
+                    return
+                cursor = conn.execute(f'SELECT {columns} FROM prompts p JOIN prompts_fts fts ON p.id = fts.rowid '
+                                      f'WHERE prompts_fts MATCH ? ORDER BY {order}', (fts_query,))
+            else:
+                cursor = conn.execute(f'SELECT {columns} FROM prompts p ORDER BY {order}')
+            cursor.arraysize = self.EXPORT_CHUNK_SIZE
+            yield from self._iter_cursor(cursor)
+
+    @staticmethod
+    def _iter_cursor(cursor: sqlite3.Cursor) -> Generator[sqlite3.Row, None, None]:
+        """Yield a cursor's rows in arraysize batches so large result sets are never held in memory at once."""
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            yield from rows
+
+    def _export_data(self, data: Iterable[sqlite3.Row], format_type: str, scope: str) -> None:
+        """Write an export on a background thread and report the result back on the main loop."""
         exporters = {'csv': self.export_to_csv, 'pdf': self.export_to_pdf, 'txt': self.export_to_txt, 'docx': self.export_to_docx}
         if format_type not in exporters:
             return messagebox.showerror("Export Error", f"Unsupported format: {format_type}")
+        if self.export_in_progress:
+            return messagebox.showinfo("Export In Progress", "Please wait for the current export to finish.")
 
-        try:
-            filename = f"prompt_mini_{scope}_{datetime.now():%Y%m%d_%H%M%S}.{format_type}"
-            filepath = os.path.join(self.settings_manager.get('export_path'), filename)
-            exporters[format_type](data, filepath)
-            messagebox.showinfo("Export Complete", f"Exported to: {filepath}")
-        except Exception as e:
-            self.logger.error(f"Export error (format: {format_type}): {e}")
-            messagebox.showerror("Export Error", f"Export failed: {e}")
+        filename = f"prompt_mini_{scope}_{datetime.now():%Y%m%d_%H%M%S}.{format_type}"
+        filepath = os.path.join(self.settings_manager.get('export_path'), filename)
+
+        def finish_export(error: Optional[str]) -> None:
+            self.set_export_running(False)
+            if error:
+                self.logger.error(f"Export error (format: {format_type}): {error}")
+                messagebox.showerror("Export Error", f"Export failed: {error}")
+            else:
+                self.logger.info(f"Exported {scope} to {filepath}")
+                messagebox.showinfo("Export Complete", f"Exported to: {filepath}")
+
+        def export_worker() -> None:
+            try:
+                exporters[format_type](data, filepath)
+                self.root.after(0, lambda: finish_export(None))
+            except Exception as e:
+                self.root.after(0, lambda msg=str(e): finish_export(msg))
+
+        self.set_export_running(True)
+        self.export_executor.submit(export_worker)
+
+    def set_export_running(self, running: bool) -> None:
+        """Track an in-flight export and disable the export menus while it runs."""
+        self.export_in_progress = running
+        state = tk.DISABLED if running else tk.NORMAL
+        for label in ("Export View", "Export All"):
+            self.file_menu.entryconfig(label, state=state)
     
-    def export_to_csv(self, data: List[sqlite3.Row], filepath: str) -> None:
-        """Export data to a CSV file."""
-        if not PANDAS_AVAILABLE: raise ImportError("pandas library is required for CSV export.")
+    def export_to_csv(self, data: Iterable[sqlite3.Row], filepath: str) -> None:
+        """Export data to a CSV file, writing rows as they are read."""
+        with open(filepath, 'w', newline='', encoding='utf-8', buffering=self.EXPORT_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(['ID', 'Created', 'Modified', 'Purpose', 'Prompt', 'Session URLs', 'Tags', 'Note'])
+            for row in data:
+                writer.writerow([row['id'], row['Created'], row['Modified'], row['Purpose'] or "",
+                                 row['Prompt'] or "", row['SessionURLs'] or "", self.format_tags(row['Tags'], "; "),
+                                 row['Note'] or ""])
         
-        records = []
-        for row in data:
-            tags = row['Tags']
-            tags_str = ""
-            if tags:
-                try: tags_str = "; ".join(json.loads(tags))
-                except (json.JSONDecodeError, TypeError): tags_str = tags
-            records.append({
-                'ID': row['id'], 'Created': row['Created'], 'Modified': row['Modified'], 'Purpose': row['Purpose'],
-                'Prompt': row['Prompt'], 'Session URLs': row['SessionURLs'], 'Tags': tags_str, 'Note': row['Note']
-            })
-        pd.DataFrame(records).to_csv(filepath, index=False)
-        
-    def export_to_pdf(self, data: List[sqlite3.Row], filepath: str) -> None:
+    def export_to_pdf(self, data: Iterable[sqlite3.Row], filepath: str) -> None:
         """Export data to a PDF document."""
         if not REPORTLAB_AVAILABLE: raise ImportError("reportlab is required for PDF export.")
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+        from reportlab.lib.styles import getSampleStyleSheet
+        from xml.sax.saxutils import escape
         
         doc = SimpleDocTemplate(filepath, pagesize=letter)
         styles = getSampleStyleSheet()
+        heading_style, normal_style, body_style = styles['h2'], styles['Normal'], styles['BodyText']
         story = []
         
+        # Paragraph text is parsed as mini-markup: stored values must be escaped, or a single '<' or '&'
+        # in any prompt aborts the whole export
         for row in data:
-            story.append(Paragraph(f"<b>ID: {row['id']}</b> ({row['Purpose'] or 'No Purpose'})", styles['h2']))
-            story.append(Paragraph(f"<i>Created: {self.format_datetime(row['Created'])} | Modified: {self.format_datetime(row['Modified'])}</i>", styles['Normal']))
+            story.append(Paragraph(f"<b>ID: {row['id']}</b> ({escape(row['Purpose'] or 'No Purpose')})", heading_style))
+            story.append(Paragraph(f"<i>{self.format_timestamps(row)}</i>", normal_style))
             
             for field in ['Prompt', 'SessionURLs', 'Note']:
                 if row[field]:
-                    story.append(Paragraph(f"<b>{field}:</b>", styles['Normal']))
-                    story.append(Paragraph(row[field].replace('\n', '<br/>'), styles['BodyText']))
+                    story.append(Paragraph(f"<b>{field}:</b>", normal_style))
+                    story.append(Paragraph(escape(row[field]).replace('\n', '<br/>'), body_style))
             
-            if row['Tags']:
-                try: tags_str = ", ".join(json.loads(row['Tags']))
-                except (json.JSONDecodeError, TypeError): tags_str = row['Tags']
-                story.append(Paragraph(f"<b>Tags:</b> {tags_str}", styles['Normal']))
+            tags_str = self.format_tags(row['Tags'])
+            if tags_str:
+                story.append(Paragraph(f"<b>Tags:</b> {escape(tags_str)}", normal_style))
                 
             story.append(Spacer(1, 20))
             
         doc.build(story)
         
-    def export_to_txt(self, data: List[sqlite3.Row], filepath: str) -> None:
+    def export_to_txt(self, data: Iterable[sqlite3.Row], filepath: str) -> None:
         """Export data to a plain text file."""
-        with open(filepath, 'w', encoding='utf-8') as f:
+        separator = "\n" + "="*80 + "\n\n"
+        with open(filepath, 'w', encoding='utf-8', buffering=self.EXPORT_BUFFER_SIZE) as f:
             for row in data:
-                f.write(f"ID: {row['id']}\nPurpose: {row['Purpose'] or ''}\n")
-                f.write(f"Created: {self.format_datetime(row['Created'])} | Modified: {self.format_datetime(row['Modified'])}\n")
+                # Assemble each record and hand it to the file layer in one call
+                parts = [f"ID: {row['id']}\nPurpose: {row['Purpose'] or ''}\n", f"{self.format_timestamps(row)}\n"]
                 
-                if row['Tags']:
-                    try: tags_str = ", ".join(json.loads(row['Tags']))
-                    except (json.JSONDecodeError, TypeError): tags_str = row['Tags']
-                    f.write(f"Tags: {tags_str}\n")
+                tags_str = self.format_tags(row['Tags'])
+                if tags_str:
+                    parts.append(f"Tags: {tags_str}\n")
 
                 for field in ['Prompt', 'SessionURLs', 'Note']:
-                    if row[field]: f.write(f"\n--- {field.upper()} ---\n{row[field]}\n")
+                    if row[field]: parts.append(f"\n--- {field.upper()} ---\n{row[field]}\n")
                     
-                f.write("\n" + "="*80 + "\n\n")
+                parts.append(separator)
+                f.writelines(parts)
                 
-    def export_to_docx(self, data: List[sqlite3.Row], filepath: str) -> None:
+    def export_to_docx(self, data: Iterable[sqlite3.Row], filepath: str) -> None:
         """Export data to a DOCX document."""
         if not DOCX_AVAILABLE: raise ImportError("python-docx is required for DOCX export.")
+        from docx import Document
+        from docx.enum.text import WD_BREAK
+        from docx.oxml import OxmlElement
+        from docx.text.paragraph import Paragraph as DocxParagraph
         
         doc = Document()
         doc.add_heading('Prompt Mini Export', 0)
-        
+
+        # doc.add_paragraph() scans the body for the trailing sectPr on every call, which makes
+        # large exports quadratic; insert new <w:p> elements directly in front of it instead
+        sect_pr = doc.element.body.sectPr
+        heading_style = doc.styles['Heading 2'].style_id
+
+        def add_paragraph(text: str = "", style_id: Optional[str] = None) -> DocxParagraph:
+            p = OxmlElement('w:p')
+            sect_pr.addprevious(p)
+            if style_id: p.style = style_id
+            paragraph = DocxParagraph(p, doc._body)
+            if text: paragraph.add_run(text)
+            return paragraph
+
         for row in data:
-            doc.add_heading(f"ID: {row['id']} - {row['Purpose'] or 'No Purpose'}", level=2)
-            doc.add_paragraph(f"Created: {self.format_datetime(row['Created'])} | Modified: {self.format_datetime(row['Modified'])}")
+            add_paragraph(f"ID: {row['id']} - {row['Purpose'] or 'No Purpose'}", heading_style)
+            add_paragraph(self.format_timestamps(row))
             
-            if row['Tags']:
-                try: tags_str = ", ".join(json.loads(row['Tags']))
-                except (json.JSONDecodeError, TypeError): tags_str = row['Tags']
-                p = doc.add_paragraph(); p.add_run('Tags: ').bold = True; p.add_run(tags_str)
+            tags_str = self.format_tags(row['Tags'])
+            if tags_str:
+                p = add_paragraph(); p.add_run('Tags: ').bold = True; p.add_run(tags_str)
 
             for field in ['Prompt', 'SessionURLs', 'Note']:
                 if row[field]:
-                    p = doc.add_paragraph(); p.add_run(f'{field}:').bold = True
-                    doc.add_paragraph(row[field])
-            doc.add_page_break()
-        doc.save(filepath)
+                    p = add_paragraph(); p.add_run(f'{field}:').bold = True
+                    add_paragraph(row[field])
+            add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+        # zipfile emits many small writes while deflating document parts
+        with open(filepath, 'wb', buffering=self.EXPORT_BUFFER_SIZE) as f:
+            doc.save(f)
         
     def backup_database(self) -> None:
-        """Create a backup copy of the database file."""
+        """Create a consistent, compacted backup copy of the live database."""
         try:
-            with self.get_db_connection() as conn:
+            with self.get_read_connection() as conn:
                 count = conn.execute('SELECT COUNT(*) FROM prompts').fetchone()[0]
             if count == 0: return messagebox.showinfo("No Data", "Database is empty, nothing to backup.")
-                
-            filename = f"prompt_mini_backup_{datetime.now():%Y%m%d_%H%M%S}.bck"
-            backup_path = os.path.join(self.settings_manager.get('export_path'), filename)
-            
-            shutil.copy2('prompt_mini.db', backup_path)
+
+            # VACUUM INTO refuses to overwrite, and two backups can fall within the same second
+            stem = os.path.join(self.settings_manager.get('export_path'), f"prompt_mini_backup_{datetime.now():%Y%m%d_%H%M%S}")
+            backup_path, suffix = f"{stem}.bck", 1
+            while os.path.exists(backup_path):
+                backup_path, suffix = f"{stem}_{suffix}.bck", suffix + 1
+
+            with self.get_db_connection() as conn:
+                # A file copy of a live WAL database can miss committed pages; both paths read a consistent snapshot
+                if sqlite3.sqlite_version_info >= (3, 27, 0):
+                    # Writes only live pages, so deleted prompts don't carry free pages into the backup
+                    conn.execute('VACUUM INTO ?', (backup_path,))
+                else:
+                    dest = sqlite3.connect(backup_path)
+                    try:
+                        conn.backup(dest, pages=1024)
+                    finally:
+                        dest.close()
             messagebox.showinfo("Backup Complete", f"Backup created: {backup_path}")
             self.logger.info(f"Database backed up to {backup_path}")
         except Exception as e:
@@ -1784,10 +2577,19 @@ class PromptMiniApp:
             
         if messagebox.askyesno("Confirm Restore", "This will ERASE all current data and replace it with the backup. This cannot be undone. Are you sure?"):
             try:
-                # Ensure db is closed by using context manager for a quick op
-                with self.get_db_connection() as conn: pass
-
-                shutil.copy2(backup_file, 'prompt_mini.db')
+                # Copy page-by-page into the live database so WAL/SHM sidecars stay consistent
+                source = sqlite3.connect(backup_file)
+                try:
+                    with self.get_db_connection() as conn:
+                        source.backup(conn, pages=1024)
+                        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                finally:
+                    source.close()
+                self.close_read_connections()
+                self.prompts_changed()
+                self.clear_prompt_cache()
+
+                # Older backups may predate the current FTS schema
                 self.init_database()
                 self.perform_search(select_first=True)
                 messagebox.showinfo("Restore Complete", "Database restored successfully.")
@@ -1802,31 +2604,43 @@ class PromptMiniApp:
         if not backup_file: return
             
         try:
-            import_conn = sqlite3.connect(backup_file)
-            import_conn.row_factory = sqlite3.Row
-            import_records = import_conn.execute('SELECT * FROM prompts ORDER BY id').fetchall()
-            import_conn.close()
+            with self.attached_database(backup_file) as conn:
+                total = conn.execute('SELECT COUNT(*) FROM bak.prompts').fetchone()[0]
+                duplicate_count = self.analyze_duplicates(conn) if total else 0
             
-            if not import_records: return messagebox.showinfo("No Data", "The backup file is empty.")
+            if not total: return messagebox.showinfo("No Data", "The backup file is empty.")
             
-            duplicate_count = self.analyze_duplicates(import_records)
-            
-            if self.show_import_confirmation(len(import_records), duplicate_count):
-                self.perform_import(import_records)
+            if self.show_import_confirmation(total, duplicate_count):
+                self.perform_import(backup_file)
         except Exception as e:
             self.logger.error(f"Import error: {e}")
             messagebox.showerror("Import Error", f"Failed to read backup file: {e}")
             
-    def analyze_duplicates(self, import_records: List[sqlite3.Row]) -> int:
-        """Analyze potential duplicates between import records and the current database."""
+    @contextmanager
+    def attached_database(self, path: str) -> Generator[sqlite3.Connection, None, None]:
+        """Provide the write connection with another database file attached as 'bak'."""
+        with self.get_db_connection() as conn:
+            conn.execute('ATTACH DATABASE ? AS bak', (path,))
+            try:
+                yield conn
+            finally:
+                # DETACH is refused while a transaction is open
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.execute('DETACH DATABASE bak')
+
+    def analyze_duplicates(self, conn: sqlite3.Connection) -> int:
+        """Count records in the attached backup whose content already exists in the current database."""
         try:
-            with self.get_db_connection() as conn:
-                existing_records = conn.execute('SELECT Purpose, Prompt, Note FROM prompts').fetchall()
-            
-            existing_set = {(r['Purpose'], r['Prompt'], r['Note']) for r in existing_records}
-            import_set = {(r['Purpose'], r['Prompt'], r['Note']) for r in import_records}
-            
-            return len(existing_set.intersection(import_set))
+            # INTERSECT matches the old set intersection (distinct rows, NULL and '' treated alike)
+            # and lets SQLite do the comparison without shipping any rows into Python
+            return conn.execute('''
+                SELECT COUNT(*) FROM (
+                    SELECT COALESCE(Purpose, ''), COALESCE(Prompt, ''), COALESCE(Note, '') FROM bak.prompts
+                    INTERSECT
+                    SELECT COALESCE(Purpose, ''), COALESCE(Prompt, ''), COALESCE(Note, '') FROM main.prompts
+                )
+            ''').fetchone()[0]
         except Exception as e:
             self.logger.error(f"Duplicate analysis error: {e}")
             return 0 # Fail safe
@@ -1861,35 +2675,43 @@ class PromptMiniApp:
         ttk.Button(btn_frame, text="Import Anyway", command=confirm).pack(side=tk.RIGHT)
         ttk.Button(btn_frame, text="Cancel", command=cancel).pack(side=tk.RIGHT, padx=5)
         
-        self.root.after(10, lambda: self.auto_size_window(dialog, 450, 250, True))
+        self.auto_size_window(dialog, 450, 250, True)
         dialog.wait_window()
         return result['confirmed']
         
-    def perform_import(self, import_records: List[sqlite3.Row]) -> None:
-        """Execute the import process, adding records to the database."""
+    def perform_import(self, backup_file: str) -> None:
+        """Execute the import process, copying the backup's records into the database."""
         try:
-            with self.get_db_connection() as conn:
-                now = datetime.now().isoformat()
-                for record in import_records:
-                    conn.execute('''
-                        INSERT INTO prompts (Created, Modified, Purpose, Prompt, SessionURLs, Tags, Note)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (now, now, record['Purpose'], record['Prompt'], record['SessionURLs'], record['Tags'], record['Note']))
+            now = datetime.now().isoformat()
+            with self.attached_database(backup_file) as conn:
+                conn.execute('BEGIN')
+                count = conn.execute('''
+                    INSERT INTO main.prompts (Created, Modified, Purpose, Prompt, SessionURLs, Tags, Note)
+                    SELECT ?, ?, Purpose, Prompt, SessionURLs, Tags, Note FROM bak.prompts ORDER BY id
+                ''', (now, now)).rowcount
                 conn.commit()
-            
+            self.prompts_changed()
+
             self.perform_search(select_first=True)
-            messagebox.showinfo("Import Complete", f"Successfully imported {len(import_records)} records.")
-            self.logger.info(f"Imported {len(import_records)} records from backup.")
+            messagebox.showinfo("Import Complete", f"Successfully imported {count} records.")
+            self.logger.info(f"Imported {count} records from backup.")
         except Exception as e:
             self.logger.error(f"Import execution error: {e}")
             messagebox.showerror("Import Error", f"Import failed during database write: {e}")
                 
     def show_console_log(self) -> None:
-        """Show a window with filterable application logs."""
-        log_window = tk.Toplevel(self.root)
+        """Show a window with filterable application logs, reusing the hidden one if it was opened before."""
+        if self.log_window is not None and self.log_window.winfo_exists():
+            self.log_window.deiconify()
+            self.log_window.lift()
+            self.log_window.event_generate('<<RefreshLog>>')
+            return
+
+        log_window = self.log_window = tk.Toplevel(self.root)
         log_window.title("Console Log")
         log_window.transient(self.root)
         log_window.withdraw()
+        log_window.protocol("WM_DELETE_WINDOW", log_window.withdraw)
         
         level_frame = ttk.Frame(log_window)
         level_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -1904,8 +2726,10 @@ class PromptMiniApp:
         log_text = scrolledtext.ScrolledText(log_window, state='disabled')
         log_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
+        level_map = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+        shown = {'total': 0}
+
         def update_log_display() -> None:
-            level_map = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
             selected_level = level_map.get(level_var.get(), 20)
             
             log_text.config(state='normal')
@@ -1913,9 +2737,35 @@ class PromptMiniApp:
             
             filtered_logs = [msg for lvl, msg in self.log_messages if lvl >= selected_level]
             log_text.insert(tk.END, '\n'.join(filtered_logs))
+            shown['total'] = self.log_message_total
                     
             log_text.config(state='disabled')
             log_text.see(tk.END)
+
+        def append_new_logs() -> None:
+            new_count = self.log_message_total - shown['total']
+            if new_count <= 0: return
+            if new_count >= len(self.log_messages):
+                return update_log_display()
+
+            selected_level = level_map.get(level_var.get(), 20)
+            start = len(self.log_messages) - new_count
+            new_logs = [msg for lvl, msg in islice(self.log_messages, start, None) if lvl >= selected_level]
+            shown['total'] = self.log_message_total
+            if not new_logs: return
+
+            # Only follow the tail if the user has not scrolled up to read older entries
+            at_bottom = log_text.yview()[1] >= 0.999
+            log_text.config(state='normal')
+            separator = '\n' if log_text.compare('end-1c', '!=', '1.0') else ''
+            log_text.insert(tk.END, separator + '\n'.join(new_logs))
+            # Keep the widget bounded like the deque it mirrors
+            excess = int(log_text.index('end-1c').split('.')[0]) - self.log_messages.maxlen
+            if excess > 0:
+                log_text.delete(1.0, f"{excess + 1}.0")
+            log_text.config(state='disabled')
+            if at_bottom:
+                log_text.see(tk.END)
             
         def on_level_change(event: tk.Event) -> None:
             self.settings_manager.set('log_level', level_var.get())
@@ -1923,15 +2773,10 @@ class PromptMiniApp:
             update_log_display()
             
         level_combo.bind('<<ComboboxSelected>>', on_level_change)
+        log_window.bind('<<RefreshLog>>', lambda e: append_new_logs())
         update_log_display()
         
-        def auto_refresh() -> None:
-            if log_window.winfo_exists():
-                update_log_display()
-                log_window.after(2000, auto_refresh)
-        auto_refresh()
-        
-        self.root.after(10, lambda: self.auto_size_window(log_window, 800, 600, True))
+        self.auto_size_window(log_window, 800, 600, True)
         
     def on_closing(self) -> None:
         """Handle application closing events, like saving window geometry."""
@@ -1940,8 +2785,19 @@ class PromptMiniApp:
             self.logger.info("Saved window geometry and settings.")
         except Exception as e:
             self.logger.error(f"Error saving window geometry: {e}")
+        try:
+            # Refresh query-planner statistics for the search queries before exiting
+            with self.get_db_connection() as conn:
+                conn.execute('PRAGMA optimize')
+        except sqlite3.Error as e:
+            self.logger.error(f"Error optimizing database: {e}")
         finally:
             self.search_executor.shutdown(wait=False)
+            self.ai_executor.shutdown(wait=False, cancel_futures=True)
+            # A running export still finishes its file before the interpreter exits
+            self.export_executor.shutdown(wait=False)
+            self.close_read_connections()
+            self.close_db_connection()
             self.root.destroy()
     
     def run(self) -> None: